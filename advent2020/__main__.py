@@ -0,0 +1,3 @@
+from advent2020.runner import main
+
+main()
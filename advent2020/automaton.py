@@ -0,0 +1,203 @@
+"""
+The cellular automaton behind the "game of life" days (11, 17 and 24).
+
+An automaton is a neighborhood (the offsets to a cell's neighbors) and
+a rule (how many live neighbors a dead cell needs to come alive, and
+how many a live cell needs to stay alive). There are two backends:
+
+* dense: the cells are a numpy array of bools, and the neighbor counts
+  are the sum of the array shifted by each offset. This is for bounded
+  grids (day 11), and for unbounded ones run for a known number of
+  steps (days 17 and 24), since after n steps nothing can be more than
+  n cells outside where it started.
+
+* sparse: the live cells are a set of points, and the neighbor counts
+  are a Counter. This is for patterns that spread out too far for
+  an array covering all of them.
+
+`run` picks the dense backend whenever the array it needs has no more
+than MAX_DENSE_CELLS cells.
+"""
+from __future__ import annotations
+from typing import Counter, FrozenSet, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+import collections
+import itertools
+import math
+
+import numpy as np
+
+Point = Tuple[int, ...]
+
+# past this many cells we go sparse
+MAX_DENSE_CELLS = 10_000_000
+
+
+def moore(dim: int) -> List[Point]:
+    """
+    Every cell that differs by at most 1 in each coordinate,
+    e.g. the 8 around a square, or the 26 around a cube
+    """
+    return [deltas for deltas in itertools.product([-1, 0, 1], repeat=dim) if any(deltas)]
+
+
+# axial coordinates (q, r): e, w, ne, nw, se, sw
+HEX: List[Point] = [(1, 0), (-1, 0), (1, -1), (0, -1), (0, 1), (-1, 1)]
+
+
+def shift_counts(alive: np.ndarray, offsets: Sequence[Point]) -> np.ndarray:
+    """
+    How many of each cell's neighbors are alive, where the
+    cells off the edge of the array count as dead
+    """
+    r = max(abs(d) for offset in offsets for d in offset)
+    # big enough for every neighbor being alive (3^6 - 1 of them doesn't fit in a byte)
+    dtype = np.min_scalar_type(len(offsets))
+    padded = np.pad(alive.astype(dtype), r)
+    counts = np.zeros(alive.shape, dtype)
+    for offset in offsets:
+        counts += padded[tuple(slice(r + d, r + d + n) for d, n in zip(offset, alive.shape))]
+    return counts
+
+
+def line_of_sight(cells: np.ndarray, offsets: Sequence[Point]) -> np.ndarray:
+    """
+    For a 2-d array of which positions are cells, the (flat) index of
+    the first cell you see looking from each position in the direction
+    of each offset, or cells.size if there isn't one. The result has
+    shape (cells.size, len(offsets)).
+    """
+    nr, nc = cells.shape
+    i, j = np.indices(cells.shape, np.int32).reshape(2, -1)
+    # the smallest type that holds every index (and cells.size), which is
+    # usually uint16 and so a quarter of the size of the default int64
+    table = np.full((cells.size, len(offsets)), cells.size, np.min_scalar_type(cells.size))
+
+    for k, (di, dj) in enumerate(offsets):
+        looking = np.arange(cells.size, dtype=np.int32)
+        for distance in range(1, max(nr, nc)):
+            ii, jj = i[looking] + di * distance, j[looking] + dj * distance
+            inside = (0 <= ii) & (ii < nr) & (0 <= jj) & (jj < nc)
+            looking, ii, jj = looking[inside], ii[inside], jj[inside]
+            seen = cells[ii, jj]
+            table[looking[seen], k] = ii[seen] * nc + jj[seen]
+            looking = looking[~seen]
+            if not looking.size:
+                break
+
+    return table
+
+
+def table_counts(alive: np.ndarray, table: np.ndarray) -> np.ndarray:
+    """
+    How many of each cell's neighbors are alive,
+    with the neighbors given by a table like line_of_sight's
+    """
+    # the extra False is what the "no neighbor" index points at
+    flat = np.append(alive.ravel(), False)
+    return flat[table].sum(axis=1, dtype=np.min_scalar_type(table.shape[1])).reshape(alive.shape)
+
+
+class Automaton(NamedTuple):
+    offsets: Sequence[Point]
+    birth: FrozenSet[int]
+    survive: FrozenSet[int]
+
+    @staticmethod
+    def of(offsets: Sequence[Point], birth: Iterable[int], survive: Iterable[int]) -> Automaton:
+        return Automaton(offsets, frozenset(birth), frozenset(survive))
+
+    def apply(self, alive: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        """
+        The rule, for a whole array of cells at once
+        """
+        size = max(len(self.offsets), int(counts.max(initial=0))) + 1
+        birth = np.zeros(size, bool)
+        birth[[n for n in self.birth if n < size]] = True
+        survive = np.zeros(size, bool)
+        survive[[n for n in self.survive if n < size]] = True
+        return np.where(alive, survive[counts], birth[counts])
+
+    def dense_step(self, alive: np.ndarray, cells: Optional[np.ndarray] = None,
+                   counts: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        One step on a numpy array. Only the positions in `cells` (default: all of them)
+        can ever be alive, and `counts` overrides the neighbor counts from the offsets.
+        """
+        if counts is None:
+            counts = shift_counts(alive, self.offsets)
+        new_alive = self.apply(alive, counts)
+        if cells is not None:
+            new_alive &= cells
+        return new_alive
+
+    def sparse_step(self, alive: Set[Point]) -> Set[Point]:
+        if 0 in self.birth:
+            raise ValueError("the sparse backend can't bring cells with no neighbors to life")
+
+        counts: Counter[Point] = collections.Counter(
+            tuple(x + dx for x, dx in zip(point, offset))
+            for point in alive
+            for offset in self.offsets
+        )
+        new_alive = {point for point, n in counts.items()
+                     if n in (self.survive if point in alive else self.birth)}
+        if 0 in self.survive:
+            new_alive.update(point for point in alive if point not in counts)
+        return new_alive
+
+    def run(self, alive: Set[Point], steps: int, backend: Optional[str] = None) -> Set[Point]:
+        """
+        The live cells after `steps` steps, with the backend
+        "dense", "sparse", or (by default) whichever fits
+        """
+        if not alive or steps == 0:
+            return set(alive)
+
+        r = max(abs(d) for offset in self.offsets for d in offset)
+        lo = np.min(list(alive), axis=0) - r * steps
+        hi = np.max(list(alive), axis=0) + r * steps
+        shape = tuple(hi - lo + 1)
+
+        if backend is None:
+            backend = "dense" if math.prod(shape) <= MAX_DENSE_CELLS else "sparse"
+
+        if backend == "sparse":
+            for _ in range(steps):
+                alive = self.sparse_step(alive)
+            return alive
+
+        grid = np.zeros(shape, bool)
+        grid[tuple((np.array(list(alive)) - lo).T)] = True
+        for _ in range(steps):
+            grid = self.dense_step(grid)
+        return {tuple(int(x) for x in point + lo) for point in np.argwhere(grid)}
+
+    def run_until_stable(self, alive: np.ndarray, cells: Optional[np.ndarray] = None,
+                         table: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Step a (bounded) numpy array until it stops changing, with the
+        neighbors from `table` if given, otherwise from the offsets
+        """
+        while True:
+            counts = table_counts(alive, table) if table is not None else None
+            new_alive = self.dense_step(alive, cells, counts)
+            if np.array_equal(new_alive, alive):
+                return alive
+            alive = new_alive
+
+
+#
+# unit tests
+#
+
+GLIDER = {(1, 0), (2, 1), (0, 2), (1, 2), (2, 2)}
+LIFE = Automaton.of(moore(2), birth=[3], survive=[2, 3])
+
+assert LIFE.run(GLIDER, 4, "sparse") == {(x + 1, y + 1) for x, y in GLIDER}
+assert LIFE.run(GLIDER, 4, "dense") == {(x + 1, y + 1) for x, y in GLIDER}
+
+# 728 neighbors, more than a byte can count
+CROWDED = Automaton.of(moore(6), birth=[], survive=range(300, 729))
+BLOCK = set(itertools.product(range(3), repeat=6))
+# (73 is what the sparse backend gets, which takes too long to check every time)
+assert len(CROWDED.run(BLOCK, 1, "dense")) == 73
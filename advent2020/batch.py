@@ -0,0 +1,114 @@
+"""
+Solve a bunch of inputs for the same day in one warm process
+(so the import, the unit tests and anything the day precomputes
+only happen once), writing one line of JSON per input as it goes:
+
+    python -m advent2020.batch 4 inputs/more/day04/
+    python -m advent2020.batch 16 'tickets/*.txt' --workers 4 > results.jsonl
+
+Each argument can be a file, a directory (meaning every file in it),
+or a glob. With --workers, each worker process loads the day once
+and then solves its share of the inputs; the results still come out
+in the order the inputs were given.
+"""
+from __future__ import annotations
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+from types import ModuleType
+import argparse
+import concurrent.futures
+import glob
+import json
+import os
+import time
+
+from advent2020.runner import PARTS, available_days, load_day, module_names
+
+# the day module, in whichever process is doing the solving
+_module: Optional[ModuleType] = None
+
+
+def expand(paths: Sequence[str]) -> List[str]:
+    """
+    Files as they are, directories as their (sorted) files, globs as their matches
+    """
+    expanded = []
+    for path in paths:
+        if os.path.isdir(path):
+            expanded.extend(sorted(os.path.join(path, name) for name in os.listdir(path)
+                                   if os.path.isfile(os.path.join(path, name))))
+        elif os.path.exists(path):
+            expanded.append(path)
+        else:
+            expanded.extend(sorted(glob.glob(path)))
+    return expanded
+
+
+def warm_up(day: str) -> None:
+    global _module
+    _module = load_day(day)
+
+
+def solve_file(path: str, parts: Sequence[int] = PARTS) -> Dict[str, Any]:
+    assert _module is not None, "call warm_up first"
+    result: Dict[str, Any] = {"input": path}
+    try:
+        with open(path) as f:
+            raw = f.read()
+
+        start = time.perf_counter()
+        parsed = _module.parse(raw)
+        seconds = {"parse": time.perf_counter() - start}
+
+        for part in parts:
+            start = time.perf_counter()
+            result[f"part{part}"] = getattr(_module, f"part{part}")(parsed)
+            seconds[f"part{part}"] = time.perf_counter() - start
+
+        result["seconds"] = seconds
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    return result
+
+
+def solve_batch(day: str, paths: Sequence[str], parts: Sequence[int] = PARTS,
+                workers: int = 1) -> Iterator[Dict[str, Any]]:
+    """
+    The results in the same order as the paths, each one as soon as it
+    (and the ones before it) are done
+    """
+    if workers <= 1:
+        warm_up(day)
+        for path in paths:
+            yield solve_file(path, parts)
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=warm_up,
+                                                initargs=(day,)) as pool:
+        yield from pool.map(solve_file, paths, [parts] * len(paths))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="advent2020-batch", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("day", help="which day, e.g. 4 or 23_v2")
+    parser.add_argument("inputs", nargs="+", help="input files, directories or globs")
+    parser.add_argument("--part", type=int, choices=PARTS, action="append",
+                        help="only run this part (can be repeated)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="solve the inputs in this many processes (default: 1)")
+    args = parser.parse_args(argv)
+
+    [day] = module_names(parser, [args.day])
+    if day not in available_days():
+        parser.error(f"no such day: {args.day}")
+
+    paths = expand(args.inputs)
+    if not paths:
+        parser.error("no inputs found")
+
+    for result in solve_batch(day, paths, args.part or PARTS, args.workers):
+        print(json.dumps({"day": day, **result}, default=str), flush=True)
+
+
+if __name__ == "__main__":
+    main()
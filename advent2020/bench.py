@@ -0,0 +1,283 @@
+"""
+Benchmark parse / part1 / part2 for every day, on the real input
+and on generated inputs 10x, 100x and 1000x as big:
+
+    python -m advent2020.bench
+    python -m advent2020.bench day07 day09 --scales 1 10 --repeat 3
+
+Each (day, scale) runs in its own process, so that one that falls over
+can be killed without taking the rest down with it, and once a day
+goes over the time budget we don't bother with its bigger scales.
+"""
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Sequence
+import argparse
+import datetime
+import json
+import math
+import multiprocessing
+import platform
+import statistics
+import time
+import tracemalloc
+
+from advent2020 import generators
+from advent2020.runner import available_days, input_path, load_day, module_names
+
+PHASES = ("parse", "part1", "part2")
+SCALES = (1, 10, 100, 1000)
+
+
+def percentile(values: Sequence[float], p: float) -> float:
+    """
+    Nearest-rank percentile
+    """
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(p * len(ordered) / 100) - 1))
+    return ordered[rank]
+
+
+def summarize(times: Sequence[float]) -> Dict[str, Any]:
+    median = statistics.median(times)
+    return {
+        "runs": len(times),
+        "min": min(times),
+        "median": median,
+        "p95": percentile(times, 95),
+        # median absolute deviation, a measure of the noise that
+        # (unlike the standard deviation) one slow run can't blow up
+        "mad": statistics.median(abs(t - median) for t in times),
+    }
+
+
+def load_input(day: str, scale: int, seed: int) -> generators.Generated:
+    if scale == 1:
+        with open(input_path(day)) as f:
+            return generators.Generated(f.read())
+    return generators.generate_scaled(day, scale, seed)
+
+
+def run_once(module: Any, raw: str) -> Dict[str, Any]:
+    """
+    Run all three phases once, returning the time and answer for each
+    """
+    times = {}
+    answers = {}
+
+    start = time.perf_counter()
+    parsed = module.parse(raw)
+    times["parse"] = time.perf_counter() - start
+
+    for part in PHASES[1:]:
+        start = time.perf_counter()
+        answers[part] = getattr(module, part)(parsed)
+        times[part] = time.perf_counter() - start
+
+    return {"times": times, "answers": answers}
+
+
+def reset_peak() -> None:
+    """
+    tracemalloc.reset_peak is new in Python 3.9. Before that, restarting
+    tracemalloc resets the peak too, but it also forgets what's already
+    allocated, so the peaks only count what gets allocated afterwards.
+    """
+    if hasattr(tracemalloc, "reset_peak"):
+        tracemalloc.reset_peak()
+    else:
+        frames = tracemalloc.get_traceback_limit()
+        tracemalloc.stop()
+        tracemalloc.start(frames)
+
+
+def peak_memory(module: Any, raw: str) -> Dict[str, int]:
+    """
+    Run all three phases once under tracemalloc,
+    returning the peak traced memory for each
+    """
+    peaks = {}
+    tracemalloc.start()
+    try:
+        reset_peak()
+        parsed = module.parse(raw)
+        peaks["parse"] = tracemalloc.get_traced_memory()[1]
+        for part in PHASES[1:]:
+            reset_peak()
+            getattr(module, part)(parsed)
+            peaks[part] = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+
+def measure(conn: Any, day: str, scale: int, seed: int, repeat: int,
+            budget: float, memory: bool) -> None:
+    """
+    Runs in the child process, sending back the timings and then
+    (if asked for) the peak memory, which is slow because of tracemalloc.
+    Stops repeating once it's used up half the budget.
+    """
+    try:
+        start = time.perf_counter()
+        module = load_day(day)
+        generated = load_input(day, scale, seed)
+        setup = time.perf_counter() - start
+
+        runs = []
+        started = time.perf_counter()
+        while len(runs) < repeat and (not runs or time.perf_counter() - started < budget / 2):
+            runs.append(run_once(module, generated.raw))
+
+        result: Dict[str, Any] = {
+            "input_bytes": len(generated.raw),
+            "setup": setup,
+            "phases": {phase: summarize([run["times"][phase] for run in runs]) for phase in PHASES},
+            "correct": {},
+        }
+
+        answers = runs[0]["answers"]
+        for part, expected in [("part1", generated.part1), ("part2", generated.part2)]:
+            result["correct"][part] = None if expected is None else answers[part] == expected
+
+        conn.send(("ok", result))
+
+        if memory:
+            conn.send(("memory", peak_memory(module, generated.raw)))
+    except Exception as e:
+        conn.send(("error", f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+
+def measure_in_child(day: str, scale: int, seed: int, repeat: int,
+                     budget: float, memory: bool) -> Dict[str, Any]:
+    """
+    If the timings don't come back within the budget, that's a timeout.
+    If the memory doesn't, we just do without it.
+    """
+    parent, child = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(
+        target=measure, args=(child, day, scale, seed, repeat, budget, memory))
+    start = time.perf_counter()
+    process.start()
+    child.close()
+
+    result: Dict[str, Any] = {"status": "timeout"}
+    if parent.poll(budget):
+        status, payload = parent.recv()
+        if status == "ok":
+            result = {"status": status, **payload}
+        else:
+            result = {"status": status, "error": payload}
+
+    if result["status"] == "ok" and memory:
+        remaining = budget - (time.perf_counter() - start)
+        if parent.poll(max(remaining, 0)):
+            status, payload = parent.recv()
+            if status == "memory":
+                for phase, peak in payload.items():
+                    result["phases"][phase]["peak_bytes"] = peak
+
+    process.terminate()
+    process.join()
+
+    return {"day": day, "scale": scale, **result}
+
+
+def benchmark(days: Sequence[str], scales: Sequence[int] = SCALES, seed: int = 0,
+              repeat: int = 5, budget: float = 300, memory: bool = True,
+              verbose: bool = False) -> List[Dict[str, Any]]:
+    results = []
+    for day in days:
+        fell_over = False
+        for scale in sorted(scales):
+            if scale > 1 and generators.generator_for(day) is None:
+                result = {"day": day, "scale": scale, "status": "no generator"}
+            elif fell_over:
+                result = {"day": day, "scale": scale, "status": "skipped"}
+            else:
+                result = measure_in_child(day, scale, seed, repeat, budget, memory)
+                fell_over = result["status"] != "ok"
+            results.append(result)
+            if verbose:
+                print(format_row(result), flush=True)
+    return results
+
+
+def format_bytes(n: Optional[int]) -> str:
+    if n is None:
+        return "-"
+    for unit in ["B", "KB", "MB"]:
+        if n < 1024:
+            return f"{n:.0f}{unit}"
+        n /= 1024
+    return f"{n:.1f}GB"
+
+
+def format_row(result: Dict[str, Any]) -> str:
+    cells = [f"{result['day']:<9}", f"{result['scale']:>5}x"]
+    if result["status"] != "ok":
+        return " ".join(cells + [result["status"], result.get("error", "")])
+
+    for phase in PHASES:
+        stats = result["phases"][phase]
+        cells.append(f"{stats['median'] * 1000:>12.2f} {stats['p95'] * 1000:>10.2f} "
+                     f"{format_bytes(stats.get('peak_bytes')):>8}")
+
+    wrong = [part for part, ok in result["correct"].items() if ok is False]
+    if wrong:
+        cells.append("WRONG: " + ", ".join(wrong))
+    return " ".join(cells)
+
+
+HEADER = (f"{'day':<9} {'scale':>6} " +
+          " ".join(f"{phase + ' med ms':>12} {'p95 ms':>10} {'peak':>8}" for phase in PHASES))
+
+
+def metadata(args: argparse.Namespace) -> Dict[str, Any]:
+    return {
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "budget": args.budget,
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="advent2020-bench", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("days", nargs="*", help="which days to run (default: all)")
+    parser.add_argument("--scales", type=int, nargs="+", default=SCALES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=300,
+                        help="seconds allowed for each (day, scale)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", dest="memory", action="store_false",
+                        help="skip the tracemalloc run")
+    parser.add_argument("--output", default="bench.json")
+    args = parser.parse_args(argv)
+
+    days = module_names(parser, args.days) or available_days()
+
+    print(HEADER)
+    results = benchmark(days, args.scales, args.seed, args.repeat, args.budget, args.memory,
+                        verbose=True)
+
+    with open(args.output, "w") as f:
+        json.dump({"meta": metadata(args), "results": results}, f, indent=2)
+
+
+#
+# unit tests
+#
+
+assert percentile(range(1, 21), 95) == 19
+assert percentile(range(1, 101), 95) == 95
+assert percentile(range(1, 101), 50) == 50
+assert percentile([3.0], 95) == percentile([3.0], 0) == 3.0
+
+
+if __name__ == "__main__":
+    main()
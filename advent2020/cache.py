@@ -0,0 +1,391 @@
+"""
+An on-disk cache of answers, so that re-running e.g. day 15 or day 23
+on the same input doesn't mean waiting for them all over again:
+
+    advent2020 15 --cache
+    python -m advent2020.cache stats
+    python -m advent2020.cache clear 15
+
+Each answer lives in its own file, keyed by (day, part, hash of the input,
+hash of the source code of the day and every advent2020 module it imports,
+directly or not), so changing the solution invalidates its answers
+automatically, even if the change is in e.g. automaton.py or utils.py. Once the directory gets bigger than `max_bytes`,
+the least recently used answers get thrown out.
+
+There's also a cache of *parsed* inputs (ParseCache, `advent2020 20 --parse-cache`),
+for when the answers aren't cached but the parsing is the same as last time.
+The parsed input is pickled (protocol 5, with any out-of-band buffers like
+numpy arrays stored separately and loaded without copying) to a file next
+to the input, e.g. inputs/.day20.txt.day20.parsed.
+"""
+from __future__ import annotations
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+import argparse
+import ast
+import hashlib
+import importlib.util
+import json
+import mmap
+import os
+import pickle
+import shutil
+import struct
+import sys
+import tempfile
+
+CACHE_DIR = ".advent2020-cache"
+MAX_BYTES = 1_000_000
+
+
+def package_imports(source: bytes, package: str) -> Set[str]:
+    """
+    The modules (or maybe not modules, for `from package import name`)
+    in `package` that the source imports
+    """
+    names = set()
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            module = package if node.level else node.module or ""
+            if node.level and node.module:
+                module = f"{package}.{node.module}"
+            names.add(module)
+            if module == package:
+                names.update(f"{module}.{alias.name}" for alias in node.names)
+    return {name for name in names if name.startswith(f"{package}.")}
+
+
+def source_files(day: str, package: str = "advent2020") -> Dict[str, str]:
+    """
+    The path of the day's module and of every module in the package
+    it imports (and they import, and so on), found without importing them
+    """
+    found: Dict[str, str] = {}
+    todo = [f"{package}.{day}"]
+    while todo:
+        name = todo.pop()
+        if name in found:
+            continue
+        spec = importlib.util.find_spec(name)
+        if spec is None or spec.origin is None or not spec.origin.endswith(".py"):
+            if name == f"{package}.{day}":
+                raise ValueError(f"no such day: {day}")
+            # `from package import name` where name isn't a module
+            continue
+        found[name] = spec.origin
+        with open(spec.origin, "rb") as f:
+            todo.extend(package_imports(f.read(), package))
+    return found
+
+
+# (day, package) -> the (path, mtime_ns, size) of each of its source files, and their hash
+_versions: Dict[Tuple[str, str], Tuple[List[Tuple[str, int, int]], str]] = {}
+
+
+def file_stamps(paths: Iterable[str]) -> List[Tuple[str, int, int]]:
+    stamps = []
+    for path in paths:
+        stat = os.stat(path)
+        stamps.append((path, stat.st_mtime_ns, stat.st_size))
+    return stamps
+
+
+def solver_version(day: str, package: str = "advent2020") -> str:
+    """
+    The hash of the source of the day and everything it imports from the package.
+    Finding and hashing those is a few ms, so it's remembered, and only
+    redone once one of the files has a new mtime or size.
+    """
+    key = (day, package)
+    if key in _versions:
+        stamps, version = _versions[key]
+        try:
+            if file_stamps(path for path, _, _ in stamps) == stamps:
+                return version
+        except OSError:
+            pass
+
+    files = sorted(source_files(day, package).items())
+    stamps = file_stamps(path for _, path in files)
+    digest = hashlib.sha256()
+    for name, path in files:
+        digest.update(name.encode() + b"\0" + file_hash(path).encode())
+    _versions[key] = (stamps, digest.hexdigest())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    def __init__(self, directory: str = CACHE_DIR, max_bytes: int = MAX_BYTES,
+                 package: str = "advent2020") -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.package = package
+
+    def path(self, day: str, part: int, raw: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(solver_version(day, self.package).encode())
+        digest.update(raw.encode())
+        return os.path.join(self.directory, f"{day}.part{part}.{digest.hexdigest()}.json")
+
+    def get(self, day: str, part: int, raw: str) -> Optional[Any]:
+        """
+        The cached answer, or None. A hit bumps the file's mtime,
+        which is what the eviction goes by.
+        """
+        path = self.path(day, part, raw)
+        try:
+            with open(path) as f:
+                answer = json.load(f)["answer"]
+            os.utime(path)
+            return answer
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def put(self, day: str, part: int, raw: str, answer: Any) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+
+        # write-then-rename, so that a reader (or another worker) never
+        # sees a half-written file
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump({"day": day, "part": part, "answer": answer}, f)
+        os.replace(tmp, self.path(day, part, raw))
+
+        self.evict()
+
+    def entries(self) -> List[os.DirEntry]:
+        try:
+            with os.scandir(self.directory) as it:
+                return [entry for entry in it if entry.name.endswith(".json")]
+        except FileNotFoundError:
+            return []
+
+    def size(self) -> int:
+        return sum(entry.stat().st_size for entry in self.entries())
+
+    def evict(self) -> None:
+        """
+        Remove the least recently used entries until we're under max_bytes
+        """
+        entries = sorted(self.entries(), key=lambda entry: entry.stat().st_mtime)
+        total = sum(entry.stat().st_size for entry in entries)
+        for entry in entries:
+            if total <= self.max_bytes:
+                break
+            total -= entry.stat().st_size
+            os.remove(entry.path)
+
+    def clear(self, days: Sequence[str] = ()) -> int:
+        """
+        Remove the entries for the given days (default: all of them),
+        returning how many were removed
+        """
+        removed = 0
+        for entry in self.entries():
+            if not days or entry.name.split(".")[0] in days:
+                os.remove(entry.path)
+                removed += 1
+        return removed
+
+
+def file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """
+    A parse cache file is
+
+        MAGIC, the header length (4 bytes), the header (JSON),
+        the pickle, and then each out-of-band buffer
+
+    with the pickle and the buffers each starting on an ALIGN-byte boundary,
+    and the header saying where they are (counting from the end of the
+    header, rounded up to ALIGN). The header also has what the
+    entry is only good for: the day's source, and the input's hash (plus
+    its mtime and size, so that when those haven't changed we don't even
+    have to read the input to know it's the same).
+    """
+    MAGIC = b"A2020P\x01"
+    ALIGN = 64
+
+    def path(self, day: str, input_path: str) -> str:
+        directory, name = os.path.split(input_path)
+        return os.path.join(directory, f".{name}.{day}.parsed")
+
+    def get(self, day: str, input_path: str) -> Optional[Any]:
+        """
+        The parsed input, or None if there isn't a valid one
+        """
+        try:
+            with open(self.path(day, input_path), "rb") as f:
+                # copy-on-write, so the buffers are writable without touching the file
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        except (OSError, ValueError):
+            return None
+
+        view = memoryview(data)
+        try:
+            header = self.read_header(view)
+            if header is None or not self.valid(header, day, input_path):
+                return None
+            base = self.data_start(header["length"])
+            [pickled, *buffers] = [view[base + start:base + end] for start, end in header["spans"]]
+            return pickle.loads(pickled, buffers=buffers)
+        except Exception:
+            # a corrupt or out of date entry is just a miss
+            return None
+
+    def read_header(self, view: memoryview) -> Optional[Dict[str, Any]]:
+        start = len(self.MAGIC) + 4
+        if bytes(view[:len(self.MAGIC)]) != self.MAGIC:
+            return None
+        [length] = struct.unpack("<I", view[len(self.MAGIC):start])
+        return {**json.loads(bytes(view[start:start + length])), "length": length}
+
+    def data_start(self, header_length: int) -> int:
+        end = len(self.MAGIC) + 4 + header_length
+        return end + -end % self.ALIGN
+
+    def valid(self, header: Dict[str, Any], day: str, input_path: str) -> bool:
+        if header["day"] != day or header["version"] != solver_version(day):
+            return False
+        stat = os.stat(input_path)
+        if (stat.st_mtime_ns, stat.st_size) == (header["mtime_ns"], header["size"]):
+            return True
+        return header["size"] == stat.st_size and header["sha256"] == file_hash(input_path)
+
+    def put(self, day: str, input_path: str, parsed: Any) -> bool:
+        """
+        Save the parsed input, returning whether we could
+        (not everything can be pickled, and not every directory can be written to)
+        """
+        buffers: List[pickle.PickleBuffer] = []
+        try:
+            pickled = pickle.dumps(parsed, protocol=5, buffer_callback=buffers.append)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return False
+
+        chunks = [memoryview(pickled)] + [buffer.raw() for buffer in buffers]
+        spans = []
+        offset = 0
+        for chunk in chunks:
+            offset += -offset % self.ALIGN
+            spans.append((offset, offset + chunk.nbytes))
+            offset += chunk.nbytes
+
+        path = self.path(day, input_path)
+        tmp = None
+        try:
+            stat = os.stat(input_path)
+            header = json.dumps({
+                "day": day,
+                "version": solver_version(day),
+                "sha256": file_hash(input_path),
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "spans": spans,
+            }).encode()
+            base = self.data_start(len(header))
+
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(self.MAGIC + struct.pack("<I", len(header)) + header)
+                for chunk, (start, _) in zip(chunks, spans):
+                    f.write(b"\0" * (base + start - f.tell()))
+                    f.write(chunk)
+            os.replace(tmp, path)
+        except OSError:
+            # e.g. a read-only directory or a full disk:
+            # no cache this time, but that's no reason to fail the solve
+            if tmp is not None and os.path.exists(tmp):
+                os.remove(tmp)
+            return False
+        return True
+
+
+#
+# unit tests
+#
+
+assert package_imports(b"from advent2020.automaton import moore\nfrom advent2020 import utils\n"
+                       b"from . import bench\nimport numpy", "advent2020") == {
+    "advent2020.automaton", "advent2020.utils", "advent2020.bench"}
+
+
+def check_result_cache() -> None:
+    """
+    A made-up package in a temp dir, so that we can edit
+    the module a "day" imports and see its answers go stale
+    """
+    root = tempfile.mkdtemp()
+    package = "_advent2020_cache_check"
+    try:
+        assert "advent2020.automaton" in source_files("day11")
+        assert "advent2020.utils" in source_files("day04")
+
+        os.makedirs(os.path.join(root, package))
+        for name, source in [("__init__", ""),
+                             ("day01", f"from {package}.helpers import add\n"),
+                             ("helpers", "def add(x, y): return x + y\n")]:
+            with open(os.path.join(root, package, f"{name}.py"), "w") as f:
+                f.write(source)
+        sys.path.insert(0, root)
+        importlib.invalidate_caches()
+
+        cache = ResultCache(os.path.join(root, "cache"), max_bytes=200, package=package)
+        cache.put("day01", 1, "input", 42)
+        assert cache.get("day01", 1, "input") == 42
+        assert cache.get("day01", 1, "other input") is None
+
+        # changing the imported module (not the day) invalidates the answer
+        with open(os.path.join(root, package, "helpers.py"), "a") as f:
+            f.write("# changed\n")
+        assert cache.get("day01", 1, "input") is None
+
+        # the oldest entries go first once there are more than max_bytes of them
+        for part, mtime in [(1, 100), (2, 200), (3, 300), (4, 400)]:
+            cache.put("day01", part, "input", "x" * 50)
+            os.utime(cache.path("day01", part, "input"), (mtime, mtime))
+        cache.evict()
+        assert cache.size() <= 200
+        assert cache.get("day01", 1, "input") is None
+        assert cache.get("day01", 4, "input") == "x" * 50
+
+        assert cache.clear(["day02"]) == 0
+        entries = len(cache.entries())
+        assert entries and cache.clear(["day01"]) == entries
+        assert not cache.entries()
+    finally:
+        sys.path.remove(root)
+        sys.modules.pop(package, None)
+        shutil.rmtree(root)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    from advent2020.runner import module_names
+
+    parser = argparse.ArgumentParser(prog="advent2020-cache", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["stats", "clear"])
+    parser.add_argument("days", nargs="*", help="which days to clear (default: all)")
+    parser.add_argument("--dir", default=CACHE_DIR)
+    args = parser.parse_args(argv)
+
+    cache = ResultCache(args.dir)
+    if args.command == "clear":
+        removed = cache.clear(module_names(parser, args.days))
+        print(f"removed {removed} entries")
+    else:
+        print(f"{len(cache.entries())} entries, {cache.size()} bytes in {cache.directory}")
+
+
+if __name__ == "__main__":
+    # this one writes files (to a temp dir), so it doesn't run on every import
+    check_result_cache()
+    main()
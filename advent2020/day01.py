@@ -1,4 +1,10 @@
-from typing import List
+from typing import Counter, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+import collections
+import math
+
+import numpy as np
+
+from advent2020.utils import Source, lines
 
 INPUTS = [
     1721,
@@ -9,36 +15,196 @@ INPUTS = [
     1456,
 ]
 
-def find_product(inputs: List[int]) -> int:
+def two_sum(values: np.ndarray, start: int, target: int) -> Optional[List[int]]:
     """
-    Find the two elements that add up to 2020
-    and return their product
+    Find positions start <= i < j with values[i] + values[j] == target,
+    where values is sorted. For each i we look up its complement with a
+    binary search (all at once), taking the *last* position with that value,
+    so that a value only pairs with itself if it's there twice.
     """
-    needs = {2020 - i for i in inputs}
+    # the smaller of the two is at most half the target
+    stop = int(np.searchsorted(values, target // 2, side="right"))
+    if stop <= start:
+        return None
 
-    for i in inputs:
-        if i in needs:
-            return i * (2020-i)
+    i = np.arange(start, stop)
+    complements = target - values[start:stop]
+    j = np.searchsorted(values, complements, side="right") - 1
+    found = np.flatnonzero((j > i) & (values[j.clip(0)] == complements))
+    if not found.size:
+        return None
 
-assert find_product(INPUTS) == 514579
+    first = found[0]
+    return [int(i[first]), int(j[first])]
+
+
+def k_sum(values: np.ndarray, start: int, k: int, target: int) -> Optional[List[int]]:
+    """
+    Find k positions from start on whose values (sorted) add up to target,
+    by trying each value as the smallest and looking for k - 1 more after it
+    """
+    if k == 2:
+        return two_sum(values, start, target)
+    if k == 1:
+        j = int(np.searchsorted(values[start:], target)) + start
+        return [j] if j < len(values) and values[j] == target else None
+
+    for i in range(start, len(values) - k + 1):
+        # the same value again would find the same things
+        if i > start and values[i] == values[i - 1]:
+            continue
+        # every value from here on is at least values[i]
+        if values[i] * k > target:
+            break
+        # even the biggest values aren't enough
+        if values[i] + values[-1] * (k - 1) < target:
+            continue
+        rest = k_sum(values, i + 1, k - 1, target - int(values[i]))
+        if rest is not None:
+            return [i] + rest
+
+    return None
+
+
+def find_k_sum(inputs: Sequence[int], k: int, target: int = 2020) -> Optional[List[int]]:
+    """
+    Find k entries that add up to target (in increasing order), or None.
+    They're k different entries, not k different values, so a value can
+    be used twice if it's in the inputs twice.
 
-def find_product3(inputs: List[int]) -> int:
+    It sorts the inputs, and then it's O(n log n) for k = 2
+    and O(n^(k-2) n log n) for bigger k, with the innermost
+    loop vectorized.
     """
-    Find the two elements that add up to 2020
+    if k == 0:
+        return [] if target == 0 else None
+    if k > len(inputs):
+        return None
+
+    values = np.sort(np.array(inputs, dtype=np.int64))
+    positions = k_sum(values, 0, k, target)
+    return None if positions is None else [int(values[p]) for p in positions]
+
+
+def find_product(inputs: Sequence[int], k: int = 2, target: int = 2020) -> int:
+    """
+    Find the k entries that add up to target
     and return their product
     """
-    needs = {2020 - i - j: (i, j)
-             for i in inputs
-             for j in inputs
-             if i != j}
+    entries = find_k_sum(inputs, k, target)
+    if entries is None:
+        raise ValueError(f"no {k} entries add up to {target}")
+    return math.prod(entries)
+
+assert find_product(INPUTS) == 514579
 
-    for i in inputs:
-        if i in needs:
-            j, k = needs[i]
-            return i * j * k
+def find_product3(inputs: Sequence[int]) -> int:
+    """
+    Find the three elements that add up to 2020
+    and return their product
+    """
+    return find_product(inputs, 3)
 
 assert find_product3(INPUTS) == 241861950
 
-with open("inputs/day01.txt") as f:
-    inputs = [int(line.strip()) for line in f]
-    print(find_product3(inputs))
\ No newline at end of file
+# an entry can only be used as many times as it appears
+assert find_k_sum([1010, 3, 7], 2) is None
+assert find_k_sum([1010, 3, 1010], 2) == [1010, 1010]
+assert find_k_sum([673, 674, 1], 3) is None
+assert find_k_sum([673, 674, 1, 673], 3) == [673, 673, 674]
+assert find_k_sum([5, -3, 10, 8, 1], 4, 0) is None
+assert find_k_sum([5, -3, 10, -8, 1], 4, 0) == [-8, -3, 1, 10]
+
+
+class PairFinder:
+    """
+    Finds pairs that add up to target in a stream of numbers, one number
+    at a time, remembering only which values it's seen. With a bound,
+    all the values have to be in range(bound), and it remembers them
+    in a bitset (bound / 8 bytes) instead of a set.
+    """
+    def __init__(self, target: int = 2020, bound: Optional[int] = None) -> None:
+        self.target = target
+        self.bound = bound
+        self.seen_set: Set[int] = set()
+        self.seen_bits = bytearray((bound + 7) // 8) if bound is not None else None
+
+    def seen(self, n: int) -> bool:
+        if self.seen_bits is None:
+            return n in self.seen_set
+        return 0 <= n < self.bound and bool(self.seen_bits[n >> 3] & (1 << (n & 7)))
+
+    def add(self, n: int) -> Optional[Tuple[int, int]]:
+        """
+        Take the next number, returning a pair if it completes one
+        """
+        pair = (self.target - n, n) if self.seen(self.target - n) else None
+        if self.seen_bits is None:
+            self.seen_set.add(n)
+        elif 0 <= n < self.bound:
+            self.seen_bits[n >> 3] |= 1 << (n & 7)
+        else:
+            raise ValueError(f"{n} is out of range({self.bound})")
+        return pair
+
+
+def numbers(source: Source) -> Iterator[int]:
+    return (int(line) for line in lines(source) if line.strip())
+
+
+def stream_pairs(source: Iterable[int], target: int = 2020,
+                 bound: Optional[int] = None) -> Iterator[Tuple[int, int]]:
+    """
+    Each pair that adds up to target, as soon as its second number comes in
+    """
+    finder = PairFinder(target, bound)
+    for n in source:
+        pair = finder.add(n)
+        if pair is not None:
+            yield pair
+
+
+def stream_answers(f: Source) -> Tuple[int, int]:
+    """
+    Both parts in a single pass, for inputs too big to read in. Part 2 needs
+    all the numbers, but only up to 3 of each value, so it only keeps those.
+    """
+    finder = PairFinder()
+    part1 = None
+    counts: Counter[int] = collections.Counter()
+
+    for n in numbers(f):
+        if part1 is None:
+            pair = finder.add(n)
+            if pair is not None:
+                part1 = pair[0] * pair[1]
+        if counts[n] < 3:
+            counts[n] += 1
+
+    if part1 is None:
+        raise ValueError("no 2 entries add up to 2020")
+    return part1, find_product3(list(counts.elements()))
+
+
+RAW = "\n".join(str(n) for n in INPUTS)
+
+assert list(stream_pairs(INPUTS)) == [(1721, 299)]
+assert list(stream_pairs([1010, 3, 1010, 2017, 1010], bound=2021)) == [(1010, 1010), (3, 2017), (1010, 1010)]
+assert stream_answers(RAW) == (514579, 241861950)
+
+
+def parse(raw: str) -> List[int]:
+    return [int(line.strip()) for line in raw.strip().split("\n")]
+
+def part1(inputs: List[int]) -> int:
+    return find_product(inputs)
+
+def part2(inputs: List[int]) -> int:
+    return find_product3(inputs)
+
+
+if __name__ == "__main__":
+    with open("inputs/day01.txt") as f:
+        inputs = parse(f.read())
+    print(part1(inputs))
+    print(part2(inputs))
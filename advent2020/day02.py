@@ -1,6 +1,12 @@
 from __future__ import annotations
 
-from typing import NamedTuple
+from typing import List, NamedTuple, Optional, Tuple, Union
+import argparse
+import concurrent.futures
+import mmap
+import os
+
+import numpy as np
 
 PASSWORDS = [
     "1-3 a: abcde",
@@ -34,7 +40,247 @@ class Password(NamedTuple):
         return Password(lo, hi, char, password)
 
 
-with open('inputs/day02.txt') as f:
-    passwords = [Password.from_line(line) for line in f]
-    print(sum(pw.is_valid2() for pw in passwords))
+def parse_passwords(raw: str) -> List[Password]:
+    return [Password.from_line(line) for line in raw.strip().split("\n")]
+
+
+def parse_ints(data: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """
+    The numbers in data[starts[i]:ends[i]], all at once,
+    one digit position at a time
+    """
+    values = np.zeros(len(starts), np.int64)
+    for k in range(int((ends - starts).max(initial=0))):
+        more = starts + k < ends
+        digits = data[np.minimum(starts + k, len(data) - 1)].astype(np.int64) - ord("0")
+        if (more & ((digits < 0) | (digits > 9))).any():
+            raise ValueError("expected a number")
+        values = np.where(more, values * 10 + digits, values)
+    return values
+
+
+def strip_spans(data: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Move each starts[i] forward and each ends[i] back past any
+    whitespace, one character at a time, like str.strip() on every line
+    """
+    whitespace = np.zeros(256, bool)
+    whitespace[list(b" \t\r\f\v")] = True
+    starts, ends = starts.copy(), ends.copy()
+    while True:
+        leading = (starts < ends) & whitespace[data[np.minimum(starts, len(data) - 1)]]
+        if not leading.any():
+            break
+        starts += leading
+    while True:
+        trailing = (starts < ends) & whitespace[data[np.maximum(ends - 1, 0)]]
+        if not trailing.any():
+            break
+        ends -= trailing
+    return starts, ends
+
+
+def first_after(data: np.ndarray, byte: str, starts: np.ndarray) -> np.ndarray:
+    """
+    For each start, the position of the first `byte` at or after it
+    (or len(data) if there isn't one). Usually there's exactly one per
+    line, and then they're already lined up with the starts.
+    """
+    positions = np.flatnonzero(data == ord(byte))
+    if len(positions) == len(starts) and (positions >= starts).all() and (positions[:-1] < starts[1:]).all():
+        return positions
+    positions = np.append(positions, len(data))
+    return positions[np.searchsorted(positions, starts)]
+
+
+class PasswordTable(NamedTuple):
+    """
+    All the passwords as columns: the i-th one has the policy lo[i]-hi[i]
+    of the character code char[i], and is data[start[i]:end[i]].
+    """
+    lo: np.ndarray
+    hi: np.ndarray
+    char: np.ndarray
+    start: np.ndarray
+    end: np.ndarray
+    data: np.ndarray
+
+    @staticmethod
+    def parse(raw: Union[str, bytes, np.ndarray]) -> PasswordTable:
+        """
+        "1-3 a: abcde" lines, found with a handful of passes over the bytes.
+        An array of bytes (e.g. a view of an mmap) gets used as it is, not copied.
+        """
+        raw = raw.encode() if isinstance(raw, str) else raw
+        data = raw if isinstance(raw, np.ndarray) else np.frombuffer(raw, np.uint8)
+
+        ends = np.flatnonzero(data == ord("\n"))
+        if not len(data) or data[-1] != ord("\n"):
+            ends = np.append(ends, len(data))
+        starts, ends = strip_spans(data, np.concatenate(([0], ends[:-1] + 1)), ends)
+        # skip blank lines
+        keep = starts < ends
+        starts, ends = starts[keep], ends[keep]
+
+        dash = first_after(data, "-", starts)
+        colon = first_after(data, ":", starts)
+        space = colon - 2
+        ok = (starts < dash) & (dash + 1 < space) & (colon + 2 < ends)
+        ok &= data[np.maximum(space, 0)] == ord(" ")
+        ok &= data[np.minimum(colon + 1, len(data) - 1)] == ord(" ")
+        if not ok.all():
+            i = np.flatnonzero(~ok)[0]
+            raise ValueError(f"bad password line: {bytes(data[starts[i]:ends[i]]).decode()!r}")
+
+        return PasswordTable(lo=parse_ints(data, starts, dash),
+                             hi=parse_ints(data, dash + 1, space),
+                             char=data[space + 1],
+                             start=colon + 2,
+                             end=ends,
+                             data=data)
+
+    def counts(self) -> np.ndarray:
+        """
+        How many times each password has its character: compare every
+        byte with the character of the password it's in (or that comes
+        before it), and then add up the matches between each start and end
+        """
+        if not len(self.start):
+            return np.zeros(0, np.int64)
+        spans = np.diff(np.append(self.start, len(self.data)))
+        chars = np.repeat(np.append(np.uint8(0), self.char), np.append(self.start[0], spans))
+        # the matches go in place of the chars, so there's only the one extra byte per byte
+        matches = np.equal(self.data, chars, out=chars)
+        matches[self.end[-1]:] = 0
+        # the odd sums are the bits between one password and the next
+        # (the last one runs to the end of the data, hence the line above), and
+        # no sum can be more than the longest span, so summing in the smallest
+        # type that holds that can't wrap (and doesn't copy all the bytes into int64s)
+        bounds = np.stack((self.start, self.end), axis=1).ravel()[:-1]
+        sums = np.add.reduceat(matches, bounds, dtype=np.min_scalar_type(int(spans.max())))
+        return sums[::2].astype(np.int64)
+
+    def has_char_at(self, position: np.ndarray) -> np.ndarray:
+        """
+        Whether each password has its character at the given (1-based) position
+        """
+        index = self.start + position - 1
+        inside = (position >= 1) & (index < self.end)
+        return inside & (self.data[np.where(inside, index, 0)] == self.char)
+
+    def count_valid(self) -> int:
+        counts = self.counts()
+        return int(((self.lo <= counts) & (counts <= self.hi)).sum())
+
+    def count_valid2(self) -> int:
+        return int((self.has_char_at(self.lo) != self.has_char_at(self.hi)).sum())
+
+
+def parse(raw: str) -> PasswordTable:
+    return PasswordTable.parse(raw)
+
+def part1(passwords: PasswordTable) -> int:
+    return passwords.count_valid()
+
+def part2(passwords: PasswordTable) -> int:
+    return passwords.count_valid2()
+
+
+# how much of the file each worker takes at a time, so that
+# the memory it needs doesn't depend on how big the file is
+CHUNK = 64 * 1024 * 1024
+
+
+def chunk_bounds(path: str, chunk_size: int = CHUNK) -> List[Tuple[int, int]]:
+    """
+    Split the file into byte ranges of about chunk_size,
+    each of which starts at the beginning of a line
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        cuts = [0]
+        while cuts[-1] + chunk_size < size:
+            newline = data.find(b"\n", cuts[-1] + chunk_size)
+            if newline == -1:
+                break
+            cuts.append(newline + 1)
+    cuts.append(size)
+    return [(start, end) for start, end in zip(cuts, cuts[1:]) if start < end]
+
+
+def audit_chunk(path: str, start: int, end: int) -> Tuple[int, int]:
+    """
+    Both counts for one range of the file, which each worker reads
+    for itself (through an mmap) rather than having it sent over
+    """
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        passwords = PasswordTable.parse(np.frombuffer(data, np.uint8, end - start, start))
+        counts = passwords.count_valid(), passwords.count_valid2()
+        # the mmap can't close while the table still has a view of it
+        del passwords
+    return counts
+
+
+def audit(path: str, workers: Optional[int] = None, chunk_size: int = CHUNK) -> Tuple[int, int]:
+    """
+    Both counts for a file too big for one core (or one machine's memory),
+    split into chunks of about chunk_size that the workers take one at a time
+    """
+    workers = workers or os.cpu_count() or 1
+    bounds = chunk_bounds(path, chunk_size)
+    if workers == 1:
+        counts = [audit_chunk(path, start, end) for start, end in bounds]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            counts = list(pool.map(audit_chunk, [path] * len(bounds), *zip(*bounds)))
+    return sum(c[0] for c in counts), sum(c[1] for c in counts)
+
+
+#
+# unit tests
+#
+
+assert part1(parse("\n".join(PASSWORDS))) == 2
+assert part2(parse("\n".join(PASSWORDS))) == 1
+
+OBJECTS = parse_passwords("\n".join(PASSWORDS))
+assert sum(pw.is_valid() for pw in OBJECTS) == 2
+assert sum(pw.is_valid2() for pw in OBJECTS) == 1
+
+# a position past the end just doesn't match
+assert part2(parse("1-9 a: ab\r\n3-10 b: cdb\r\n")) == 2
+
+# counts too big for a byte
+assert parse("1-300 a: " + "a" * 300 + "\n2-2 b: bb").counts().tolist() == [300, 2]
+
+# whitespace around a line is fine (as it was for Password.from_line), a missing space isn't
+assert part1(parse("  1-3 a: abcde \n\t1-3 b: cdefg")) == 1
+for bad in ["1-3 a:abcde", "1-3 a abcde", "13 a: abcde", "1-3 a: "]:
+    try:
+        parse(bad)
+        assert False, bad
+    except ValueError:
+        pass
+
+#
+# problem
+#
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="count the valid passwords; "
+                                                 "with --workers, split the file across processes")
+    parser.add_argument("input", nargs="?", default="inputs/day02.txt")
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args()
+
+    if args.workers:
+        for count in audit(args.input, args.workers):
+            print(count)
+    else:
+        with open(args.input) as f:
+            passwords = parse(f.read())
+        print(part1(passwords))
+        print(part2(passwords))
 
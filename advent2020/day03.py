@@ -1,27 +1,38 @@
 from __future__ import annotations
 
-from typing import List, NamedTuple, Tuple, Set
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+import math
+
+import numpy as np
 
 
 Point = Tuple[int, int]
 
+# '#' -> '1', '.' -> '0', so a reversed row is a binary number
+TO_BITS = str.maketrans("#.", "10")
+
 
 class Slope(NamedTuple):
-    trees: Set[Point]
+    """
+    Each row is an int whose bit x is set if there's a tree in column x,
+    which for a 31-wide map is a few dozen bytes a row
+    instead of a set entry (and a tuple) per tree
+    """
+    rows: List[int]
     width: int
     height: int
 
     @staticmethod
     def parse(raw: str) -> Slope:
-        lines = raw.split("\n")
-        trees = {(x, y)
-                 for y, row in enumerate(lines)
-                 for x, c in enumerate(row.strip())
-                 if c == '#'}
+        lines = [line.strip() for line in raw.split("\n")]
+        rows = [int(line[::-1].translate(TO_BITS) or "0", 2) for line in lines]
         width = len(lines[0])
         height = len(lines)
 
-        return Slope(trees, width, height)
+        return Slope(rows, width, height)
+
+    def has_tree(self, x: int, y: int) -> bool:
+        return bool(self.rows[y] >> (x % self.width) & 1)
 
 
 def count_trees(
@@ -32,9 +43,8 @@ def count_trees(
     num_trees = 0
     x = 0
     for y in range(0, slope.height, down):
-        if (x, y) in slope.trees:
-            num_trees += 1
-        x = (x + right) % slope.width 
+        num_trees += slope.rows[y] >> x & 1
+        x = (x + right) % slope.width
     return num_trees
 
 
@@ -51,12 +61,56 @@ SLOPES = [
     (1, 2)
 ]
 
+# how many rows count_trees_many looks at at once
+BLOCK = 4096
+
+
+def tree_matrix(slope: Slope) -> np.ndarray:
+    """
+    The map as a (height, width) array of bools
+    """
+    num_bytes = (slope.width + 7) // 8
+    packed = np.frombuffer(b"".join(row.to_bytes(num_bytes, "little") for row in slope.rows),
+                           np.uint8).reshape(slope.height, num_bytes)
+    return np.unpackbits(packed, axis=1, bitorder="little")[:, :slope.width].astype(bool)
+
+
+def count_trees_many(slope: Slope, slopes: Sequence[Point]) -> List[int]:
+    """
+    count_trees for lots of slopes at once. Only right % width matters,
+    so for each distinct `down` we count the trees for all its (distinct)
+    `right`s at once, with one gather per block of rows. That's a pass
+    over the map per distinct `down`, however many slopes there are.
+    """
+    grid = tree_matrix(slope)
+    counts: Dict[Point, int] = {}
+
+    for down in {down for _, down in slopes}:
+        rights = np.array(sorted({right % slope.width for right, d in slopes if d == down}))
+        rows = grid[::down]
+        totals = np.zeros(len(rights), np.int64)
+        for start in range(0, len(rows), BLOCK):
+            # the k-th row we visit is at column k * right
+            k = np.arange(start, min(start + BLOCK, len(rows)))
+            columns = np.outer(k, rights) % slope.width
+            totals += rows[k[:, None], columns].sum(axis=0)
+        counts.update(((int(right), down), int(total)) for right, total in zip(rights, totals))
+
+    return [counts[right % slope.width, down] for right, down in slopes]
+
+
 def trees_product(slope: Slope, slopes: List[Point]) -> int:
-    product = 1
-    for right, down in slopes:
-        product *= count_trees(slope, right=right, down=down)
+    return math.prod(count_trees_many(slope, slopes))
+
+
+def parse(raw: str) -> Slope:
+    return Slope.parse(raw.strip())
+
+def part1(slope: Slope) -> int:
+    return count_trees(slope)
 
-    return product
+def part2(slope: Slope) -> int:
+    return trees_product(slope, SLOPES)
 
 
 #
@@ -80,13 +134,15 @@ SLOPE = Slope.parse(RAW)
 assert count_trees(SLOPE) == 7
 
 assert trees_product(SLOPE, SLOPES) == 336
+assert count_trees_many(SLOPE, SLOPES + [(14, 1), (-8, 3)]) == [
+    count_trees(SLOPE, right, down) for right, down in SLOPES + [(14, 1), (-8, 3)]]
 
 #
 # PROBLEM
 #
 
-with open('inputs/day03.txt') as f:
-    raw = f.read()
-slope = Slope.parse(raw)
-print(count_trees(slope))
-print(trees_product(slope, SLOPES))
\ No newline at end of file
+if __name__ == "__main__":
+    with open('inputs/day03.txt') as f:
+        slope = parse(f.read())
+    print(part1(slope))
+    print(part2(slope))
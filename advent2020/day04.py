@@ -1,25 +1,49 @@
-from typing import Dict, List
+from __future__ import annotations
+from typing import (TYPE_CHECKING, Callable, Dict, FrozenSet, Iterable, Iterator, List,
+                    NamedTuple, Pattern, Tuple, Union)
 import re
+import sys
 
+import numpy as np
 
-Passport = Dict[str, str]
+from advent2020.utils import Source, records, timed
+
+if TYPE_CHECKING:
+    import pandas as pd
 
-def make_passport(raw: str) -> Passport:
-    lines = raw.strip().split("\n")
-    lines = [line.strip() for line in lines if line.strip()]
 
+Passport = Dict[str, str]
+
+def passport_from_lines(lines: Iterable[str]) -> Passport:
+    """
+    Goes through each line once, splitting it into key:value chunks.
+    The keys are interned, so all the passports share
+    the same few key strings instead of each having its own.
+    """
     passport = {}
 
     for line in lines:
-        for chunk in line.split(" "):
-            key, value = chunk.split(":")
-            passport[key] = value
+        for chunk in line.split():
+            key, value = chunk.split(":", 1)
+            passport[sys.intern(key)] = value
 
     return passport
 
-def make_passports(raw: str) -> List[Passport]:
-    chunks = raw.split("\n\n")
-    return [make_passport(chunk) for chunk in chunks if chunk.strip()]
+def make_passport(raw: str) -> Passport:
+    return passport_from_lines(raw.split("\n"))
+
+def iter_passports(raw: Source) -> Iterator[Passport]:
+    """
+    One passport at a time, from a string or straight from a file
+    (or any other iterable of lines), so that going through a file
+    only ever needs one record's worth of it in memory
+    """
+    for record in records(raw):
+        yield passport_from_lines(record)
+
+@timed
+def make_passports(raw: Source) -> List[Passport]:
+    return list(iter_passports(raw))
 
 DEFAULT_FIELDS = ["byr", "iyr", "eyr", "hgt", "hcl", "ecl", "pid"]
 
@@ -29,34 +53,212 @@ def is_valid(passport: Passport,
     return all(field in passport for field in required_fields)
 
 
-def is_valid2(passport: Passport) -> bool:
-    checks = [
-        1920 <= int(passport.get('byr', -1)) <= 2002,
-        2010 <= int(passport.get('iyr', -1)) <= 2020,
-        2020 <= int(passport.get('eyr', -1)) <= 2030,
-        is_valid_height(passport.get('hgt', '')),
-        re.match(r"^#[0-9a-f]{6}$", passport.get('hcl', '')),
-        passport.get('ecl') in ('amb', 'blu', 'brn', 'gry', 'grn', 'hzl', 'oth'),
-        re.match(r"^[0-9]{9}$", passport.get('pid', ''))
-    ]
-
-    return all(checks)
-
-def is_valid_height(hgt: str) -> bool:
-    if hgt.endswith('cm'):
-        hgt = hgt.replace('cm', '')
-        try:
-            return 150 <= int(hgt) <= 193
-        except:
-            return False
-    elif hgt.endswith("in"):
-        hgt = hgt.replace("in", "")
-        try:
-            return 59 <= int(hgt) <= 76 
-        except:
-            return False
-
-    return False
+# a rule takes a field's value and says whether it's OK
+Rule = Callable[[str], bool]
+
+# ranges up to this big get checked by looking the value up in a set
+# of all the valid strings, which is a lot faster than parsing it
+MAX_ENUMERATED = 10_000
+
+
+def int_range(lo: int, hi: int) -> Rule:
+    """
+    Leading zeros aren't allowed, however the range gets checked
+    """
+    if hi - lo < MAX_ENUMERATED:
+        return one_of(str(n) for n in range(lo, hi + 1))
+
+    def check(value: str) -> bool:
+        # isdigit alone lets through things like "²"
+        return value.isascii() and value.isdigit() and value == str(int(value)) and lo <= int(value) <= hi
+    return check
+
+def pattern(regex: Union[str, Pattern]) -> Rule:
+    return re.compile(regex).fullmatch  # type: ignore
+
+def one_of(values: Iterable[str]) -> Rule:
+    return frozenset(values).__contains__
+
+def with_units(ranges: Dict[str, Tuple[int, int]]) -> Rule:
+    """
+    e.g. "183cm", with a range for each unit
+    """
+    if sum(hi - lo for lo, hi in ranges.values()) < MAX_ENUMERATED:
+        return one_of(f"{n}{unit}" for unit, (lo, hi) in ranges.items() for n in range(lo, hi + 1))
+
+    checks = [(unit, int_range(lo, hi)) for unit, (lo, hi) in ranges.items()]
+
+    def check(value: str) -> bool:
+        for unit, in_range in checks:
+            if value.endswith(unit):
+                return in_range(value[:-len(unit)])
+        return False
+    return check
+
+
+Schema = Dict[str, Rule]
+
+def compile_schema(schema: Schema) -> Callable[[Passport], bool]:
+    """
+    One function that checks the fields in order and
+    stops at the first one that's missing or fails its rule.
+    (A missing field shows up as "", so rules shouldn't accept that.)
+    """
+    rules = list(schema.items())
+
+    def validate(passport: Passport) -> bool:
+        get = passport.get
+        for field, rule in rules:
+            if not rule(get(field, "")):
+                return False
+        return True
+    return validate
+
+
+HAIR_COLOR = re.compile(r"^#[0-9a-f]{6}$")
+PASSPORT_ID = re.compile(r"^[0-9]{9}$")
+EYE_COLORS = frozenset(['amb', 'blu', 'brn', 'gry', 'grn', 'hzl', 'oth'])
+
+# the rules as data, so that both the per-record checks (rule_for)
+# and the whole-table ones (mask_for) can be built from the same declarations
+
+class IntRange(NamedTuple):
+    lo: int
+    hi: int
+
+class WithUnits(NamedTuple):
+    ranges: Dict[str, Tuple[int, int]]
+
+class Matches(NamedTuple):
+    regex: Pattern
+
+class OneOf(NamedTuple):
+    values: FrozenSet[str]
+
+Spec = Union[IntRange, WithUnits, Matches, OneOf]
+
+def rule_for(spec: Spec) -> Rule:
+    if isinstance(spec, IntRange):
+        return int_range(spec.lo, spec.hi)
+    if isinstance(spec, WithUnits):
+        return with_units(spec.ranges)
+    if isinstance(spec, Matches):
+        return pattern(spec.regex)
+    if isinstance(spec, OneOf):
+        return one_of(spec.values)
+    raise TypeError(f"not a rule: {spec!r}")
+
+
+SPECS: Dict[str, Spec] = {
+    "byr": IntRange(1920, 2002),
+    "iyr": IntRange(2010, 2020),
+    "eyr": IntRange(2020, 2030),
+    "hgt": WithUnits({"cm": (150, 193), "in": (59, 76)}),
+    "hcl": Matches(HAIR_COLOR),
+    "ecl": OneOf(EYE_COLORS),
+    "pid": Matches(PASSPORT_ID),
+}
+
+SCHEMA: Schema = {field: rule_for(spec) for field, spec in SPECS.items()}
+
+is_valid_height = SCHEMA["hgt"]
+
+is_valid2 = compile_schema(SCHEMA)
+
+
+#
+# the same checks, on a whole table of passports at once
+#
+
+FIELDS = DEFAULT_FIELDS + ["cid"]
+
+
+def passport_frame(passports: Iterable[Passport]) -> pd.DataFrame:
+    """
+    One column per field, with NaN for the passports missing it
+    """
+    # pandas takes a while to import, and only this needs it
+    import pandas as pd
+    return pd.DataFrame(passports, columns=FIELDS)
+
+
+def int_range_mask(column: pd.Series, lo: int, hi: int) -> pd.Series:
+    """
+    int_range for a whole column, which (like it) looks the values up
+    in all the valid strings when there aren't too many of them
+    """
+    if hi - lo < MAX_ENUMERATED:
+        return column.isin([str(n) for n in range(lo, hi + 1)])
+
+    import pandas as pd
+    digits = column.str.fullmatch(r"0|[1-9][0-9]*", na=False)
+    return digits & pd.to_numeric(column.where(digits), errors="coerce").between(lo, hi)
+
+
+def with_units_mask(column: pd.Series, ranges: Dict[str, Tuple[int, int]]) -> pd.Series:
+    """
+    with_units for a whole column: the number before each unit has to be in
+    its range, which (as there) is a lookup when the ranges are small
+    """
+    if sum(hi - lo for lo, hi in ranges.values()) < MAX_ENUMERATED:
+        return column.isin([f"{n}{unit}" for unit, (lo, hi) in ranges.items() for n in range(lo, hi + 1)])
+
+    ok = column.isna() & False
+    for unit, (lo, hi) in ranges.items():
+        has_unit = column.str[-len(unit):] == unit
+        ok |= has_unit & int_range_mask(column.str[:-len(unit)], lo, hi)
+    return ok
+
+
+def valid_mask(frame: pd.DataFrame, required_fields: List[str] = DEFAULT_FIELDS) -> np.ndarray:
+    return np.logical_and.reduce([frame[field].notna().to_numpy() for field in required_fields])
+
+
+def mask_for(column: pd.Series, spec: Spec) -> pd.Series:
+    """
+    rule_for, for a whole column at once (with missing values failing)
+    """
+    if isinstance(spec, IntRange):
+        return int_range_mask(column, spec.lo, spec.hi)
+    if isinstance(spec, WithUnits):
+        return with_units_mask(column, spec.ranges)
+    if isinstance(spec, Matches):
+        return column.str.fullmatch(spec.regex, na=False)
+    if isinstance(spec, OneOf):
+        return column.isin(spec.values)
+    raise TypeError(f"not a rule: {spec!r}")
+
+
+def valid2_mask(frame: pd.DataFrame, specs: Dict[str, Spec] = SPECS) -> np.ndarray:
+    """
+    The same checks as is_valid2, a column at a time. This is *not* the
+    fast way to count valid passports: str.fullmatch on a column of strings
+    is still a regex call per row, and with the frame to build as well it
+    comes out about twice as slow as is_valid2 on each passport. It's for
+    when you already have the table and want a mask to slice it with.
+    """
+    masks = [mask_for(frame[field], spec) for field, spec in specs.items()]
+    return np.logical_and.reduce([mask.to_numpy(dtype=bool) for mask in masks])
+
+
+def parse(raw: str) -> List[Passport]:
+    return make_passports(raw)
+
+def part1(passports: List[Passport]) -> int:
+    return sum(is_valid(passport) for passport in passports)
+
+def part2(passports: List[Passport]) -> int:
+    return sum(is_valid2(passport) for passport in passports)
+
+def stream_answers(f: Source) -> Tuple[int, int]:
+    """
+    Both parts in a single pass, for inputs too big to read in
+    """
+    num_valid = num_valid2 = 0
+    for passport in iter_passports(f):
+        num_valid += is_valid(passport)
+        num_valid2 += is_valid2(passport)
+    return num_valid, num_valid2
 
 #
 # UNIT TESTS
@@ -110,12 +312,52 @@ iyr:2010 hgt:158cm hcl:#b6652a ecl:blu byr:1944 eyr:2021 pid:093154719""")
 assert all(is_valid2(passport) for passport in VALID)
 assert not any(is_valid2(passport) for passport in INVALID)
 
+assert is_valid_height("60in") and is_valid_height("190cm")
+assert not any(is_valid_height(h) for h in ["190in", "190", "cm", "1e2cm", "-60in"])
+
+# the same answers whether or not the range is small enough to enumerate
+BIG = MAX_ENUMERATED * 10
+assert [int_range(1920, 2002)(v) for v in ["1950", "01950", "0"]] == [True, False, False]
+assert [int_range(0, BIG)(v) for v in ["1950", "01950", "0"]] == [True, False, True]
+assert not with_units({"cm": (0, BIG)})("0160cm") and with_units({"cm": (0, BIG)})("160cm")
+
+
+def check_frame() -> None:
+    """
+    The table version against the per-record one. Importing pandas
+    takes longer than the rest of the day put together, so this only
+    runs when running the day itself (and pandas is there).
+    """
+    try:
+        import pandas as pd
+    except ImportError:
+        return
+
+    passports = PASSPORTS + VALID + INVALID
+    frame = passport_frame(passports)
+    assert list(valid_mask(frame)) == [is_valid(passport) for passport in passports]
+    assert list(valid2_mask(frame)) == [is_valid2(passport) for passport in passports]
+
+    # the ranges too big to look up, against the rules they mirror
+    numbers = pd.Series(["12cm", "0150cm", "1e2cm", "cm", "150in", "99in", None])
+    any_cm = WithUnits({"cm": (0, MAX_ENUMERATED * 10), "in": (59, 76)})
+    assert list(mask_for(numbers, any_cm)) == [rule_for(any_cm)(n or "") for n in numbers]
+
+    # a rule added to the specs shows up in both
+    specs = {**SPECS, "cid": OneOf(frozenset(["147"]))}
+    validate = compile_schema({field: rule_for(spec) for field, spec in specs.items()})
+    assert list(valid2_mask(frame, specs)) == [validate(passport) for passport in passports]
+    assert 0 < sum(valid2_mask(frame, specs)) < sum(valid2_mask(frame))
+
 #
 # PROBLEMS
 #
 
-with open('inputs/day04.txt') as f:
-    passports = make_passports(f.read())
+if __name__ == "__main__":
+    check_frame()
+
+    with open('inputs/day04.txt') as f:
+        passports = parse(f.read())
 
-    print(sum(is_valid(passport) for passport in passports))
-    print(sum(is_valid2(passport) for passport in passports))
+    print(part1(passports))
+    print(part2(passports))
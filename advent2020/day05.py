@@ -4,7 +4,9 @@ FFFBBBFRRR: row 14, column 7, seat ID 119.
 BBFFBBFRLL: row 102, column 4, seat ID 820.
 """
 
-from typing import NamedTuple
+from typing import Iterable, NamedTuple, Optional
+
+import numpy as np
 
 class Seat(NamedTuple):
     row: int
@@ -35,19 +37,143 @@ def find_seat2(bp: str) -> Seat:
     col = int(''.join({'R': '1', 'L': '0'}[c] for c in bp[-3:]), 2)
     return Seat(row, col)
 
+# a boarding pass is just a seat id written in binary
+TO_BINARY = str.maketrans("FBLR", "0101")
+# what each of the 10 characters has to be, for a 0 and for a 1
+ZEROS = np.frombuffer(b"FFFFFFFLLL", np.uint8)
+ONES = np.frombuffer(b"BBBBBBBRRR", np.uint8)
+POWERS = 2 ** np.arange(9, -1, -1, dtype=np.uint16)
+
+def seat_id(bp: str) -> int:
+    return int(bp.translate(TO_BINARY), 2)
+
+def seat_ids(raw: str) -> np.ndarray:
+    """
+    The seat ids for all the passes at once, by turning them into
+    a matrix of bits and multiplying that by the powers of 2
+    """
+    passes = raw.split()
+    if any(len(bp) != 10 for bp in passes):
+        raise ValueError("boarding passes have 10 characters")
+    # anything that isn't ASCII becomes a "?", which then fails the check below
+    chars = np.frombuffer("".join(passes).encode("ascii", "replace"), np.uint8).reshape(-1, 10)
+    bits = chars == ONES
+    if not (bits | (chars == ZEROS)).all():
+        raise ValueError("boarding passes are 7 of F or B and then 3 of L or R")
+    return bits @ POWERS
+
+# 128 rows of 8 seats
+SEATS = 1024
+
+class SeatIndex:
+    """
+    Which seats are taken, as one byte per seat id in range(size). To keep
+    track of many flights at once, give flight f the ids f * SEATS + seat_id
+    and ask about range(f * SEATS, (f + 1) * SEATS).
+    """
+    def __init__(self, size: int = SEATS, ids: Iterable[int] = ()) -> None:
+        self.taken = bytearray(size)
+        self.count = 0
+        self.update(ids)
+
+    def __contains__(self, i: int) -> bool:
+        return 0 <= i < len(self.taken) and bool(self.taken[i])
+
+    def __len__(self) -> int:
+        return self.count
+
+    def add(self, i: int) -> None:
+        if not 0 <= i < len(self.taken):
+            raise ValueError(f"{i} is out of range({len(self.taken)})")
+        self.count += not self.taken[i]
+        self.taken[i] = 1
+
+    def update(self, ids: Iterable[int]) -> None:
+        """
+        Add a lot of seats at once
+        """
+        ids = np.asarray(ids if isinstance(ids, np.ndarray) else list(ids), dtype=np.int64)
+        if ids.size and (ids.min() < 0 or ids.max() >= len(self.taken)):
+            raise ValueError(f"seat ids have to be in range({len(self.taken)})")
+        self.mask()[ids] = True
+        self.count = int(np.count_nonzero(self.mask()))
+
+    def remove(self, i: int) -> None:
+        if i not in self:
+            raise KeyError(i)
+        self.taken[i] = 0
+        self.count -= 1
+
+    def mask(self) -> np.ndarray:
+        # a view, not a copy, so it sees later adds and removes
+        return np.frombuffer(self.taken, dtype=bool)
+
+    def count_range(self, lo: int = 0, hi: Optional[int] = None) -> int:
+        """
+        How many of the seats in range(lo, hi) are taken
+        """
+        return int(np.count_nonzero(self.mask()[lo:hi]))
+
+    def gaps(self, lo: int = 0, hi: Optional[int] = None) -> np.ndarray:
+        """
+        The empty seats in range(lo, hi) whose neighbors
+        (also in the range) are both taken
+        """
+        taken = self.mask()[lo:hi]
+        empty = ~taken[1:-1] & taken[:-2] & taken[2:]
+        return np.flatnonzero(empty) + lo + 1
+
+def parse(raw: str) -> np.ndarray:
+    return seat_ids(raw)
+
+def part1(ids: np.ndarray) -> int:
+    return int(ids.max())
+
+def part2(ids: np.ndarray) -> int:
+    missing = SeatIndex(SEATS, ids).gaps()
+    assert len(missing) == 1
+    return int(missing[0])
+
 #
-# PROBLEMS
+# UNIT TESTS
 #
 
-with open('inputs/day05.txt') as f:
-    seats = [find_seat2(bp.strip()) for bp in f]
+assert find_seat("BFFFBBFRRR") == find_seat2("BFFFBBFRRR") == Seat(70, 7)
+assert find_seat("BBFFBBFRLL").seat_id == 820
+assert seat_id("FFFBBBFRRR") == 119
 
-print(max(seat.seat_id for seat in seats))
+RAW = """BFFFBBFRRR
+FFFBBBFRRR
+BBFFBBFRLL"""
 
-seat_ids = [seat.seat_id for seat in seats]
+assert seat_ids(RAW).tolist() == [567, 119, 820]
+assert seat_ids(RAW).dtype == np.uint16
+
+for bad in ["RRRRRRRFFF", "BFFFBBFRRB", "BFFFBBFRR", "BFFFBBFRRé"]:
+    try:
+        seat_ids(bad)
+        assert False, bad
+    except ValueError:
+        pass
+
+INDEX = SeatIndex(16, [1, 2, 4, 6, 8, 9, 10, 12])
+assert 4 in INDEX and 5 not in INDEX and 99 not in INDEX
+assert INDEX.gaps().tolist() == [3, 5, 7, 11]
+assert INDEX.gaps(4, 9).tolist() == [5, 7]
+assert INDEX.count_range(4, 10) == 4 and len(INDEX) == 8
+INDEX.add(5)
+INDEX.remove(10)
+assert INDEX.gaps().tolist() == [3, 7] and len(INDEX) == 8
+INDEX.update([3, 10, 10])
+assert INDEX.gaps().tolist() == [7, 11] and len(INDEX) == 10
+
+#
+# PROBLEMS
+#
 
-lo = min(seat_ids)
-hi = max(seat_ids)
+if __name__ == "__main__":
+    with open('inputs/day05.txt') as f:
+        seats = parse(f.read())
 
-print([x for x in range(lo, hi) 
-        if x not in seat_ids]) # and x-1 in seat_ids and x+1 in seat_ids])
\ No newline at end of file
+    print(part1(seats))
+    print(part2(seats))
@@ -1,26 +1,48 @@
-from typing import List
+from typing import List, Tuple
 from collections import Counter
 
+from advent2020.utils import Source, records
 
-def count_yeses(raw: str) -> int:
-    groups = raw.split("\n\n")
+
+def count_yeses(raw: Source) -> int:
     num_yeses = 0
-    for group in groups:
-        people = group.split("\n")
+    for people in records(raw):
         yeses = {c for person in people for c in person}
         num_yeses += len(yeses)
     return num_yeses
 
 
-def count_yeses2(raw: str) -> int:
-    groups = raw.split("\n\n")
+def count_yeses2(raw: Source) -> int:
     num_yeses = 0
-    for group in groups:
-        people = group.split("\n")
+    for group in records(raw):
+        people = list(group)
         yeses = Counter(c for person in people for c in person)
         num_yeses += sum(count == len(people) for c, count in yeses.items())
     return num_yeses
 
+
+def stream_answers(f: Source) -> Tuple[int, int]:
+    """
+    Both parts in a single pass, for inputs too big to read in
+    """
+    num_yeses = num_yeses2 = 0
+    for group in records(f):
+        people = list(group)
+        yeses = Counter(c for person in people for c in person)
+        num_yeses += len(yeses)
+        num_yeses2 += sum(count == len(people) for c, count in yeses.items())
+    return num_yeses, num_yeses2
+
+
+def parse(raw: str) -> str:
+    return raw.strip()
+
+def part1(raw: str) -> int:
+    return count_yeses(raw)
+
+def part2(raw: str) -> int:
+    return count_yeses2(raw)
+
 # 
 # UNIT TESTS
 #
@@ -43,12 +65,14 @@ b"""
 
 assert count_yeses(RAW) == 11
 assert count_yeses2(RAW) == 6
+assert stream_answers(RAW) == (11, 6)
 
 #
 # PROBLEMS
 #
 
-with open('inputs/day06.txt') as f:
-    raw = f.read()
-    print(count_yeses(raw))
-    print(count_yeses2(raw))
\ No newline at end of file
+if __name__ == "__main__":
+    with open('inputs/day06.txt') as f:
+        raw = parse(f.read())
+    print(part1(raw))
+    print(part2(raw))
@@ -8,6 +8,8 @@ class Bag(NamedTuple):
     contains: Dict[str, int]
 
 
+BAGS = re.compile(r"bags?$")
+
 def parse_line(line: str) -> Bag:
     part1, part2 = line.split(" contain ")
     color = part1[:-5]
@@ -20,7 +22,7 @@ def parse_line(line: str) -> Bag:
 
     contained = part2.split(", ")
     for subbag in contained:
-        subbag = re.sub(r"bags?$", "", subbag)
+        subbag = BAGS.sub("", subbag)
         first_space = subbag.find(" ")
         count = int(subbag[:first_space].strip())
         color2 = subbag[first_space:].strip()
@@ -68,6 +70,16 @@ def num_bags_inside(
             stack.append((child, count * multiplier))
     return num_bags
 
+
+def parse(raw: str) -> List[Bag]:
+    return make_bags(raw.strip())
+
+def part1(bags: List[Bag]) -> int:
+    return len(can_eventually_contain(bags, 'shiny gold'))
+
+def part2(bags: List[Bag]) -> int:
+    return num_bags_inside(bags, "shiny gold")
+
 #
 # UNIT TESTS
 #
@@ -93,13 +105,17 @@ dark violet bags contain no other bags."""
 BAGS1 = make_bags(RAW)
 BAGS2 = make_bags(RAW2)
 
+assert part1(BAGS1) == 4
+assert part2(BAGS1) == 32
+assert part2(BAGS2) == 126
+
 #
 # PROBLEMS
 #
 
-with open('inputs/day07.txt') as f:
-    raw = f.read()
+if __name__ == "__main__":
+    with open('inputs/day07.txt') as f:
+        bags = parse(f.read())
 
-bags = make_bags(raw)
-print(len(can_eventually_contain(bags, 'shiny gold')))
-print(num_bags_inside(bags, "shiny gold"))
\ No newline at end of file
+    print(part1(bags))
+    print(part2(bags))
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from typing import NamedTuple, List
 
+from advent2020.utils import timed
+
 class Instruction(NamedTuple):
     op: str
     arg: int
@@ -18,6 +20,7 @@ class Booter:
         self.accumulator = 0
         self.idx = 0
 
+    @timed
     def execute_one(self) -> None:
         op, arg = self.instructions[self.idx]
 
@@ -69,6 +72,18 @@ def find_terminator(instructions: List[Instruction]) -> int:
 
     raise RuntimeError("never terminated")
 
+
+def parse(raw: str) -> List[Instruction]:
+    return [Instruction.parse(line) for line in raw.strip().split("\n")]
+
+def part1(instructions: List[Instruction]) -> int:
+    booter = Booter(instructions)
+    booter.run_until_repeat()
+    return booter.accumulator
+
+def part2(instructions: List[Instruction]) -> int:
+    return find_terminator(instructions)
+
 #
 # UNIT TESTS
 #
@@ -95,11 +110,9 @@ assert find_terminator(INSTRUCTIONS) == 8
 # PROBLEM
 #
 
-with open('inputs/day08.txt') as f:
-    raw = f.read()
+if __name__ == "__main__":
+    with open('inputs/day08.txt') as f:
+        instructions = parse(f.read())
 
-instructions = [Instruction.parse(line) for line in raw.split("\n")]
-booter = Booter(instructions)
-booter.run_until_repeat()
-print(booter.accumulator)
-print(find_terminator(instructions))
+    print(part1(instructions))
+    print(part2(instructions))
@@ -38,6 +38,16 @@ def encryption_weakness(numbers: List[int], lookback: int = 25) -> int:
     slice = range_with_sum(numbers, target)
     return min(slice) + max(slice)
 
+
+def parse(raw: str) -> List[int]:
+    return [int(x) for x in raw.strip().split("\n")]
+
+def part1(numbers: List[int]) -> int:
+    return next(not_sums(numbers))
+
+def part2(numbers: List[int]) -> int:
+    return encryption_weakness(numbers)
+
 #
 # Unit Tests
 #
@@ -73,9 +83,9 @@ assert encryption_weakness(NUMBERS, 5) == 62
 # Problem
 #
 
-with open('inputs/day09.txt') as f:
-    raw = f.read()
+if __name__ == "__main__":
+    with open('inputs/day09.txt') as f:
+        numbers = parse(f.read())
 
-numbers = [int(x) for x in raw.split("\n")]
-print(next(not_sums(numbers)))
-print(encryption_weakness(numbers))
\ No newline at end of file
+    print(part1(numbers))
+    print(part2(numbers))
@@ -13,7 +13,7 @@ def count_skips(adapters: List[int]) -> Counter:
     return Counter(diffs)
 
 def count_paths(adapters: List[int]) -> int:
-    adapters.append(0)
+    adapters = adapters + [0]
     adapters.append(max(adapters) + 3)
 
     output = adapters[-1]
@@ -39,6 +39,17 @@ def count_paths(adapters: List[int]) -> int:
 
     return num_ways[output]
 
+
+def parse(raw: str) -> List[int]:
+    return [int(x) for x in raw.strip().split("\n")]
+
+def part1(adapters: List[int]) -> int:
+    skips = count_skips(adapters)
+    return skips[1] * skips[3]
+
+def part2(adapters: List[int]) -> int:
+    return count_paths(adapters)
+
 #
 # Unit Tests
 #
@@ -103,9 +114,9 @@ assert count_paths(ADAPTERS2) == 19208
 # Problem
 #
 
-with open('inputs/day10.txt') as f:
-    adapters = [int(x) for x in f]
+if __name__ == "__main__":
+    with open('inputs/day10.txt') as f:
+        adapters = parse(f.read())
 
-skips = count_skips(adapters)
-print(skips[1] * skips[3])
-print(count_paths(adapters))
\ No newline at end of file
+    print(part1(adapters))
+    print(part2(adapters))
@@ -1,103 +1,52 @@
 from __future__ import annotations
 from typing import List
-from collections import Counter
 
-Grid = List[List[str]]
+import numpy as np
 
-neighbors = [(-1, 0), (-1, -1), (-1, +1), 
-             ( 0,-1),           ( 0, +1),
-             ( 1, 1), (1,  0),  (1, - 1)]
-
-def next_value(grid: Grid, i: int, j: int) -> str:
-    nr = len(grid)
-    nc = len(grid[0])
-
-    counts = Counter(
-        grid[i + di][j + dj]
-        for di, dj in neighbors
-        if 0 <= i + di < nr and 0 <= j + dj < nc
-    )
-
-    c = grid[i][j]    
-
-    if c == 'L' and counts['#'] == 0:
-        return '#'
-    if c == '#' and counts['#'] >= 4:
-        return 'L'
-    else:
-        return c
-
-def step(grid: Grid) -> Grid:
-    return [
-        [
-            next_value(grid, i, j)
-            for j, c in enumerate(row)
-        ]
-        for i, row in enumerate(grid)
-    ]
+from advent2020.automaton import Automaton, line_of_sight, moore
 
-def final_seats(grid: Grid) -> int:
-    while True:
-        next_grid = step(grid)
-        if next_grid == grid:
-            break
-        grid = next_grid
+Grid = List[List[str]]
 
-    return sum(c == '#' for row in grid for c in row)
+neighbors = moore(2)
 
+# an empty seat with no occupied neighbors fills up,
+# an occupied one with too many empties out
+SEATING = Automaton.of(neighbors, birth=[0], survive=range(4))
+SEATING2 = Automaton.of(neighbors, birth=[0], survive=range(5))
 
-### PART 2
 
+def seats(grid: Grid) -> np.ndarray:
+    return np.array([[c != '.' for c in row] for row in grid])
 
-def first_seat(grid: Grid, i: int, j: int, di: int, dj: int) -> str:
-    nr = len(grid)
-    nc = len(grid[0])
 
-    while True:
-        i += di
-        j += dj
+def occupied(grid: Grid) -> np.ndarray:
+    return np.array([[c == '#' for c in row] for row in grid])
 
-        if 0 <= i < nr and 0 <= j < nc:
-            c = grid[i][j]
-            if c == '#' or c == 'L':
-                return c
-        else:
-            return '.'
 
+def final_seats(grid: Grid) -> int:
+    return int(SEATING.run_until_stable(occupied(grid), seats(grid)).sum())
 
-def next_value2(grid: Grid, i: int, j: int) -> str:
-    counts = Counter(
-        first_seat(grid, i, j, di, dj)
-        for di, dj in neighbors
-    )
 
-    c = grid[i][j]    
+### PART 2
+
 
-    if c == 'L' and counts['#'] == 0:
-        return '#'
-    if c == '#' and counts['#'] >= 5:
-        return 'L'
-    else:
-        return c
+def final_seats2(grid: Grid) -> int:
+    """
+    here the neighbors are the first seat in each direction,
+    which we only have to find once
+    """
+    table = line_of_sight(seats(grid), neighbors)
+    return int(SEATING2.run_until_stable(occupied(grid), seats(grid), table).sum())
 
 
-def step2(grid: Grid) -> Grid:
-    return [
-        [
-            next_value2(grid, i, j)
-            for j, c in enumerate(row)
-        ]
-        for i, row in enumerate(grid)
-    ]
+def parse(raw: str) -> Grid:
+    return [list(line.strip()) for line in raw.strip().split("\n")]
 
-def final_seats2(grid: Grid) -> int:
-    while True:
-        next_grid = step2(grid)
-        if next_grid == grid:
-            break
-        grid = next_grid
+def part1(grid: Grid) -> int:
+    return final_seats(grid)
 
-    return sum(c == '#' for row in grid for c in row)
+def part2(grid: Grid) -> int:
+    return final_seats2(grid)
 
 
 #
@@ -123,8 +72,9 @@ assert final_seats2(GRID) == 26
 #
 # problem
 #
-with open('inputs/day11.txt') as f:
-    grid = [list(line.strip()) for line in f]
+if __name__ == "__main__":
+    with open('inputs/day11.txt') as f:
+        grid = parse(f.read())
 
-# print(final_seats(grid))
-print(final_seats2(grid))
\ No newline at end of file
+    print(part1(grid))
+    print(part2(grid))
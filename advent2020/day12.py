@@ -7,7 +7,7 @@ Action R means to turn right the given number of degrees.
 Action F means to move forward by the given value in the direction the ship is currently facing."""
 
 from __future__ import annotations
-from typing import NamedTuple
+from typing import List, NamedTuple
 from dataclasses import dataclass
 
 class Action(NamedTuple):
@@ -85,6 +85,22 @@ class ShipAndWaypoint:
             raise ValueError(f"unknown action {action}")            
 
 
+def parse(raw: str) -> List[Action]:
+    return [Action.parse(line) for line in raw.strip().split("\n")]
+
+def part1(actions: List[Action]) -> int:
+    ship = Ship()
+    for action in actions:
+        ship.move(action)
+    return abs(ship.x) + abs(ship.y)
+
+def part2(actions: List[Action]) -> int:
+    saw = ShipAndWaypoint()
+    for action in actions:
+        saw.move(action)
+    return abs(saw.ship_x) + abs(saw.ship_y)
+
+
 # 
 # unit tests
 #
@@ -115,15 +131,10 @@ assert SAW.ship_y == -72
 # problem
 #
 
-with open('inputs/day12.txt') as f:
-    raw = f.read()
-    actions = [Action.parse(line) for line in raw.split("\n")]
-    ship = Ship()
-    for action in actions:
-        ship.move(action)
-    print(abs(ship.x) + abs(ship.y))
+if __name__ == "__main__":
+    with open('inputs/day12.txt') as f:
+        actions = parse(f.read())
+
+    print(part1(actions))
+    print(part2(actions))
 
-    saw = ShipAndWaypoint()
-    for action in actions:
-        saw.move(action)
-    print(abs(saw.ship_x) + abs(saw.ship_y))
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import List
+from typing import List, Tuple
 from functools import reduce
 
 def earliest_bus(depart: int, buses: List[int]) -> int:
@@ -63,6 +63,25 @@ def chinese_remainder2(divisors: List[int], remainders: List[int]) -> int:
 
     return solution % increment
 
+
+Notes = Tuple[int, List[str]]
+
+def parse(raw: str) -> Notes:
+    line1, line2 = raw.strip().split("\n")
+    depart = int(line1)
+    buses_raw = [x for x in line2.split(",")]
+    return depart, buses_raw
+
+def part1(notes: Notes) -> int:
+    depart, buses_raw = notes
+    buses = [int(x) for x in buses_raw if x != "x"]
+    return earliest_bus(depart, buses)
+
+def part2(notes: Notes) -> int:
+    _, buses_raw = notes
+    divisors, remainders = zip(*make_factors(buses_raw))
+    return chinese_remainder2(list(divisors), list(remainders))
+
 #
 # unit tests
 #
@@ -75,6 +94,9 @@ DEPART = int(L1)
 BUSES = [int(x) for x in L2.split(",") if x != "x"]
 assert earliest_bus(DEPART, BUSES) == 295
 
+assert part1(parse(RAW)) == 295
+assert part2(parse(RAW)) == 1068781
+
 #
 # scratch around
 #
@@ -98,13 +120,10 @@ t % 19 == 19 - 7
 # problem
 #
 
-with open('inputs/day13.txt') as f:
-    depart = int(next(f))
-    buses_raw = [x for x in next(f).split(",")]
-    buses = [int(x) for x in buses_raw if x != "x"]
-
-
-print(earliest_bus(depart, buses))
+if __name__ == "__main__":
+    with open('inputs/day13.txt') as f:
+        notes = parse(f.read())
 
-n, a = zip(*make_factors(buses_raw))
+    print(part1(notes))
+    print(part2(notes))
 
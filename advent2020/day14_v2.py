@@ -65,7 +65,6 @@ def run2(program: List[str]) -> Dict[int, int]:
     memory = defaultdict(int)
 
     for line in program:
-        print(line)
         if line.startswith("mask"):
             mask = line.split(" = ")[-1]
         else:
@@ -73,12 +72,20 @@ def run2(program: List[str]) -> Dict[int, int]:
             value = int(value_s)
             pos = int(mem[4:-1])
 
-            print(pos, value)
-
             for pos2 in apply_multi_mask(pos, mask):
                 memory[pos2] = value
 
     return memory
+
+
+def parse(raw: str) -> List[str]:
+    return raw.strip().split("\n")
+
+def part1(program: List[str]) -> int:
+    return sum(run(program).values())
+
+def part2(program: List[str]) -> int:
+    return sum(run2(program).values())
     
 
 #
@@ -107,10 +114,9 @@ assert sum(MEMORY2.values()) == 208
 # problem
 #
 
-with open('inputs/day14.txt') as f:
-    program = [line for line in f]
-    memory = run(program)
-    print(sum(memory.values()))
+if __name__ == "__main__":
+    with open('inputs/day14.txt') as f:
+        program = parse(f.read())
 
-    memory2 = run2(program)
-    print(sum(memory2.values()))
\ No newline at end of file
+    print(part1(program))
+    print(part2(program))
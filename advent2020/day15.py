@@ -3,6 +3,9 @@ from __future__ import annotations
 from typing import List, Iterator, Dict
 import itertools
 
+from advent2020.utils import timed
+
+@timed
 def play_game(starting_numbers: List[int]) -> Iterator[int]:
     last_seen: Dict[int, int] = {}
     gap = None
@@ -38,24 +41,36 @@ def n2020(starting_numbers: List[int]) -> int:
 def n30000000(starting_numbers: List[int]) -> int:
     game = play_game(starting_numbers)
     for i in range(30000000):
-        if i % 1000 == 0:
-            print(i, i / 30000000)
         n = next(game)
     return n
 
 
+def parse(raw: str) -> List[int]:
+    return [int(n) for n in raw.strip().split(",")]
+
+def part1(starting_numbers: List[int]) -> int:
+    return n2020(starting_numbers)
+
+def part2(starting_numbers: List[int]) -> int:
+    return n30000000(starting_numbers)
+
+
 #
 # unit tests
 #
 
 game = play_game([0, 3, 6])
 output = [next(game) for _ in range(10)]
+assert output == [0, 3, 6, 0, 3, 3, 1, 0, 4, 0]
 assert n2020([0, 3, 6]) == 436
 
 # 
 # problem
 #
 
-numbers = [2,20,0,4,1,17]
-# print(n2020(numbers))
-# print(n30000000(numbers))
\ No newline at end of file
+if __name__ == "__main__":
+    with open('inputs/day15.txt') as f:
+        numbers = parse(f.read())
+
+    print(part1(numbers))
+    print(part2(numbers))
@@ -1,7 +1,10 @@
 from __future__ import annotations
-from typing import Dict, List, NamedTuple, Tuple
+from typing import Dict, Iterable, List, NamedTuple, Set, Tuple
+import itertools
 import math
 
+from advent2020.utils import Source, records
+
 Range = Tuple[int, int]
 
 def make_range(s: str) -> Range:
@@ -59,27 +62,39 @@ class Problem(NamedTuple):
         return self._replace(nearby_tickets=valid_tickets)
 
     @staticmethod
-    def parse(raw: str) -> Problem:
-        a, b, c = raw.split("\n\n")
-        b = b.split("\n")[-1]
-
-        rules = [Rule.parse(line) for line in a.split("\n")]
-        my_ticket = make_ticket(b)
-        nearby_tickets = [make_ticket(line) for line in c.split("\n")[1:]]
+    def parse(raw: Source) -> Problem:
+        sections = records(raw)
+        rules = [Rule.parse(line) for line in next(sections)]
+        my_ticket = make_ticket(list(next(sections))[-1])
+        nearby_tickets = [make_ticket(line) for line in itertools.islice(next(sections), 1, None)]
 
         return Problem(rules, my_ticket, nearby_tickets)
 
 
+def narrow(candidates: List[Set[Rule]], ticket: Ticket) -> None:
+    """
+    Rule out (in place) the rules that this ticket's values break
+    """
+    for cand, n in zip(candidates, ticket):
+        cand.difference_update([rule for rule in cand if not rule.is_valid(n)])
+
+
+def field_candidates(rules: List[Rule], num_fields: int, tickets: Iterable[Ticket]) -> List[Set[Rule]]:
+    # candidates[i] is the possibilities for the ith field
+    candidates = [set(rules) for _ in range(num_fields)]
+    for ticket in tickets:
+        narrow(candidates, ticket)
+    return candidates
+
+
 def identify_fields(problem: Problem) -> List[str]:
-    num_fields = len(problem.your_ticket)
     tickets = [problem.your_ticket] + problem.nearby_tickets
+    candidates = field_candidates(problem.rules, len(problem.your_ticket), tickets)
+    return assign_fields(candidates)
 
-    # candidates[i] is the possibilities for the ith field
-    candidates = [
-        {rule for rule in problem.rules 
-         if all(rule.is_valid(ticket[i]) for ticket in tickets)}
-        for i in range(num_fields)
-    ]
+
+def assign_fields(candidates: List[Set[Rule]]) -> List[str]:
+    num_fields = len(candidates)
 
     while True:
         unique_rules = [rule for cand in candidates if len(cand) == 1 for rule in cand]
@@ -93,6 +108,50 @@ def identify_fields(problem: Problem) -> List[str]:
                 candidates[i] = cand
 
 
+def parse(raw: str) -> Problem:
+    return Problem.parse(raw.strip())
+
+def part1(problem: Problem) -> int:
+    return problem.error_rate()
+
+def departure_product(fields: List[str], your_ticket: Ticket) -> int:
+    departure_values = [
+        n 
+        for name, n in zip(fields, your_ticket)
+        if name.startswith('departure')
+    ]
+    assert len(departure_values) == 6
+    return math.prod(departure_values)
+
+def part2(problem: Problem) -> int:
+    problem2 = problem.discard_invalid_tickets()
+    fields = identify_fields(problem2)
+    return departure_product(fields, problem2.your_ticket)
+
+def stream_answers(f: Source) -> Tuple[int, int]:
+    """
+    Both parts in a single pass over the nearby tickets,
+    without holding on to them, for inputs too big to read in
+    """
+    sections = records(f)
+    rules = [Rule.parse(line) for line in next(sections)]
+    your_ticket = make_ticket(list(next(sections))[-1])
+    problem = Problem(rules, your_ticket, [])
+
+    error_rate = 0
+    candidates = field_candidates(rules, len(your_ticket), [your_ticket])
+
+    for line in itertools.islice(next(sections), 1, None):
+        ticket = make_ticket(line)
+        invalid = [n for n in ticket if not problem.valid_for_any_field(n)]
+        if invalid:
+            error_rate += sum(invalid)
+        else:
+            narrow(candidates, ticket)
+
+    return error_rate, departure_product(assign_fields(candidates), your_ticket)
+
+
 #
 # unit test
 #
@@ -122,19 +181,9 @@ assert PROBLEM2.nearby_tickets == [[7, 3, 47]]
 # problem
 #
 
-with open('inputs/day16.txt') as f:
-    raw = f.read()
-    problem = Problem.parse(raw)
-    print(problem.error_rate())
+if __name__ == "__main__":
+    with open('inputs/day16.txt') as f:
+        problem = parse(f.read())
 
-    problem2 = problem.discard_invalid_tickets()
-    fields = identify_fields(problem2)
-
-    departure_values = [
-        n 
-        for name, n in zip(fields, problem2.your_ticket)
-        if name.startswith('departure')
-    ]
-    assert len(departure_values) == 6
-    print(math.prod(departure_values))
-    
\ No newline at end of file
+    print(part1(problem))
+    print(part2(problem))
@@ -1,43 +1,23 @@
 from __future__ import annotations
-from typing import NamedTuple, Set, Iterator, Tuple, List
-import itertools
+from typing import Set, Tuple
 
-
-Point = Tuple[int, ...]
+from advent2020.automaton import Automaton, moore
 
 
-def neighbors(point: Point) -> Iterator[Point]:
-    dim = len(point)
-    changes = [[-1, 0, 1] for _ in range(dim)]
-    for deltas in itertools.product(*changes):
-        if any(d != 0 for d in deltas):
-            p: List[int] = [x + dx for x, dx in zip(point, deltas)]
-            yield tuple(p)
+Point = Tuple[int, ...]
 
 Grid = Set[Point]
 
 
-def step(grid: Grid) -> Grid:
-    new_candidates = {
-        p 
-        for point in grid 
-        for p in neighbors(point)
-        if p not in grid
-    }
+def conway(dim: int) -> Automaton:
+    return Automaton.of(moore(dim), birth=[3], survive=[2, 3])
 
-    new_grid = set()
 
-    for point in grid:
-        n = sum(p in grid for p in neighbors(point))
-        if n in (2, 3):
-            new_grid.add(point)
-
-    for point in new_candidates:
-        n = sum(p in grid for p in neighbors(point))
-        if n == 3:
-            new_grid.add(point)
-
-    return new_grid
+def step(grid: Grid) -> Grid:
+    if not grid:
+        return set()
+    dim = len(next(iter(grid)))
+    return conway(dim).sparse_step(grid)
 
 def make_grid(raw: str, dim: int):
     lines = raw.split("\n")
@@ -49,6 +29,19 @@ def make_grid(raw: str, dim: int):
         if c == '#'
     }
 
+def num_active(raw: str, dim: int, num_steps: int = 6) -> int:
+    return len(conway(dim).run(make_grid(raw, dim), num_steps))
+
+
+def parse(raw: str) -> str:
+    return raw.strip()
+
+def part1(raw: str) -> int:
+    return num_active(raw, 3)
+
+def part2(raw: str) -> int:
+    return num_active(raw, 4)
+
 #
 # unit tests
 #
@@ -63,28 +56,17 @@ for _ in range(6):
     GRID3 = step(GRID3)
 
 assert len(GRID3) == 112
-
-GRID4 = make_grid(RAW, 4)
-
-for _ in range(6):
-    GRID4 = step(GRID4)
-
-assert len(GRID4) == 848
+assert num_active(RAW, 3) == 112
+assert num_active(RAW, 4) == 848
+assert step(set()) == set()
 
 # 
 # problem
 #
 
-with open('inputs/day17.txt') as f:
-    raw = f.read()
+if __name__ == "__main__":
+    with open('inputs/day17.txt') as f:
+        raw = parse(f.read())
 
-grid3 = make_grid(raw, 3)
-for _ in range(6):
-    grid3 = step(grid3)
-print(len(grid3))
-
-grid4 = make_grid(raw, 4)
-for i in range(6):
-    print(i)
-    grid4 = step(grid4)
-print(len(grid4))
+    print(part1(raw))
+    print(part2(raw))
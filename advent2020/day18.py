@@ -23,10 +23,10 @@ def evaluate(expression: Expression) -> int:
 
 # Regex to match open-parens ... closed-parens
 # with no parens in between 
-rgx = r"\([^\(]+?\)"
+rgx = re.compile(r"\([^\(]+?\)")
 
 def evaluate_raw(raw: str) -> int:
-    while (match := re.search(rgx, raw)):
+    while (match := rgx.search(raw)):
         value = evaluate(match.group()[1:-1].split())
         raw = raw[:match.start()] + str(value) + raw[match.end():]
     else:
@@ -50,7 +50,7 @@ def evaluate2(expression: Expression) -> int:
 
 
 def evaluate_raw2(raw: str) -> int:
-    while (match := re.search(rgx, raw)):
+    while (match := rgx.search(raw)):
         value = evaluate2(match.group()[1:-1].split())
         raw = raw[:match.start()] + str(value) + raw[match.end():]
     else:
@@ -58,6 +58,16 @@ def evaluate_raw2(raw: str) -> int:
         return evaluate2(tokens)
 
 
+def parse(raw: str) -> List[str]:
+    return raw.strip().split("\n")
+
+def part1(lines: List[str]) -> int:
+    return sum(evaluate_raw(line) for line in lines)
+
+def part2(lines: List[str]) -> int:
+    return sum(evaluate_raw2(line) for line in lines)
+
+
 #
 # unit tests
 #
@@ -74,8 +84,9 @@ assert evaluate_raw2(RAW2) == 23340
 # problem
 #
 
-with open('inputs/day18.txt') as f:
-    raw = f.read()
-    lines = raw.split("\n")
-    print(sum(evaluate_raw(line) for line in lines))
-    print(sum(evaluate_raw2(line) for line in lines))
\ No newline at end of file
+if __name__ == "__main__":
+    with open('inputs/day18.txt') as f:
+        lines = parse(f.read())
+
+    print(part1(lines))
+    print(part2(lines))
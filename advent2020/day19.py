@@ -2,12 +2,15 @@ from __future__ import annotations
 from typing import NamedTuple, List, Optional, Tuple, Iterator
 from collections import deque
 
+from advent2020.utils import timed
+
 class Rule(NamedTuple):
     id: int
     literal: Optional[str] = None
     subrules: List[List[int]] = []
 
     @staticmethod
+    @timed
     def parse(line: str) -> Rule:
         rule_id, rest = line.strip().split(": ")
         if rest.startswith('"'):
@@ -69,8 +72,10 @@ def check(s: str, rules: List[Rule]) -> bool:
     return False
 
 
-def parse(raw: str):
-    raw_rules, raw_strings = raw.split("\n\n")
+Problem = Tuple[List[Rule], List[str]]
+
+def parse(raw: str) -> Problem:
+    raw_rules, raw_strings = raw.strip().split("\n\n")
     rules = [Rule.parse(rr) for rr in raw_rules.split("\n")]
     rules.sort()  # <--- ARGH
     assert all(rule.id == i for i, rule in enumerate(rules))
@@ -78,6 +83,18 @@ def parse(raw: str):
     return rules, strings
 
 
+def part1(problem: Problem) -> int:
+    rules, strings = problem
+    return sum(check(s, rules) for s in strings)
+
+def part2(problem: Problem) -> int:
+    rules, strings = problem
+    rules = rules[:]
+    rules[8] = Rule.parse("8: 42 | 42 8")
+    rules[11] = Rule.parse("11: 42 31 | 42 11 31")
+    return sum(check(s, rules) for s in strings)
+
+
 #
 # unit tests
 #
@@ -103,26 +120,9 @@ assert sum(check(s, RULES) for s in STRINGS) == 2
 # problem
 # 
 
-with open('inputs/day19.txt') as f:
-    raw = f.read()
-rules, strings = parse(raw)
-
-# good = 0
-# for i, s in enumerate(strings):
-#     print(i, s)
-#     if check(s, rules):
-#         good += 1
-
-# print(good)
-
-# part 2
-rules[8] = Rule.parse("8: 42 | 42 8")
-rules[11] = Rule.parse("11: 42 31 | 42 11 31")
-
-good = 0
-for i, s in enumerate(strings):
-    print(i, s)
-    if check(s, rules):
-        good += 1
+if __name__ == "__main__":
+    with open('inputs/day19.txt') as f:
+        problem = parse(f.read())
 
-print(good)
\ No newline at end of file
+    print(part1(problem))
+    print(part2(problem))
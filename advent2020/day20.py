@@ -3,6 +3,8 @@ from typing import NamedTuple, List, Tuple, Iterator, Dict, Set, Optional
 from collections import Counter
 import math
 
+from advent2020.utils import timed
+
 Edge = str
 
 class Edges(NamedTuple):
@@ -93,6 +95,7 @@ class Tile(NamedTuple):
         )
 
     @staticmethod
+    @timed
     def parse(raw_tile: str) -> Tile:
         lines = raw_tile.split("\n")
         tile_id = int(lines[0].split()[-1][:-1])
@@ -326,6 +329,20 @@ def roughness(glued: Pixels) -> int:
                for i, row in enumerate(t.pixels)
                for j, c in enumerate(row))
 
+
+def parse(raw: str) -> List[Tile]:
+    return make_tiles(raw.strip())
+
+def part1(tiles: List[Tile]) -> int:
+    corners = find_corners(tiles)
+    assert len(corners) == 4
+    return math.prod(tile.tile_id for tile in corners)
+
+def part2(tiles: List[Tile]) -> int:
+    images = assemble_image(tiles)
+    glued = glue(images)
+    return roughness(glued)
+
 #
 # unit tests
 #
@@ -451,13 +468,9 @@ assert roughness(GLUED) == 273
 # problem
 #
 
-with open('inputs/day20.txt') as f:
-    raw = f.read()
+if __name__ == "__main__":
+    with open('inputs/day20.txt') as f:
+        tiles = parse(f.read())
 
-tiles = make_tiles(raw)
-corners = find_corners(tiles)
-assert len(corners) == 4
-print(math.prod(tile.tile_id for tile in corners))
-images = assemble_image(tiles)
-glued = glue(images)
-print(roughness(glued))
\ No newline at end of file
+    print(part1(tiles))
+    print(part2(tiles))
@@ -1,6 +1,8 @@
 from __future__ import annotations
-from typing import NamedTuple, Set, List, Dict
-from collections import defaultdict
+from typing import NamedTuple, Set, List, Dict, Iterable, Iterator, Tuple
+from collections import Counter, defaultdict
+
+from advent2020.utils import Source, lines
 
 class Food(NamedTuple):
     ingredients: List[str]
@@ -15,7 +17,7 @@ class Food(NamedTuple):
             allergens = parts[1][:-1].split(", ")
         return Food(parts[0].split(), allergens)
 
-def candidates(foods: List[Food]) -> Dict[str, Set[str]]:
+def candidates(foods: Iterable[Food]) -> Dict[str, Set[str]]:
     # for each allergen, what could its ingredients be
     candidates: Dict[str, Set[str]] = {}
 
@@ -45,13 +47,26 @@ def candidates(foods: List[Food]) -> Dict[str, Set[str]]:
 
     return candidates 
 
-def count_no_allergens(foods: List[Food]) -> int:
-    cands = candidates(foods)
+def count_ingredients(foods: Iterable[Food], counts: Counter) -> Iterator[Food]:
+    """
+    Pass the foods through, counting their ingredients along the way,
+    so that we only need to go through them once
+    """
+    for food in foods:
+        counts.update(food.ingredients)
+        yield food
+
+def no_allergen_count(cands: Dict[str, Set[str]], counts: Counter) -> int:
     can_contain = {ingredient for cands in cands.values() for ingredient in cands}
 
-    return sum(ingredient not in can_contain
-                for food in foods
-                for ingredient in food.ingredients)
+    return sum(count
+               for ingredient, count in counts.items()
+               if ingredient not in can_contain)
+
+def count_no_allergens(foods: Iterable[Food]) -> int:
+    counts: Counter = Counter()
+    cands = candidates(count_ingredients(foods, counts))
+    return no_allergen_count(cands, counts)
 
 def arrange(candidates: Dict[str, Set[str]]) -> str:
     assert all(len(s) == 1 for s in candidates.values())
@@ -59,6 +74,28 @@ def arrange(candidates: Dict[str, Set[str]]) -> str:
     return ",".join(next(iter(cands)) for allergen, cands in sorted(candidates.items()))
 
 
+def iter_foods(raw: Source) -> Iterator[Food]:
+    return (Food.parse(line) for line in lines(raw) if line.strip())
+
+def parse(raw: str) -> List[Food]:
+    return list(iter_foods(raw))
+
+def part1(foods: List[Food]) -> int:
+    return count_no_allergens(foods)
+
+def part2(foods: List[Food]) -> str:
+    return arrange(candidates(foods))
+
+def stream_answers(f: Source) -> Tuple[int, str]:
+    """
+    Both parts in a single pass, for inputs too big to read in
+    (it only has to remember each distinct ingredient)
+    """
+    counts: Counter = Counter()
+    cands = candidates(count_ingredients(iter_foods(f), counts))
+    return no_allergen_count(cands, counts), arrange(cands)
+
+
 #
 # unit tests
 #
@@ -78,10 +115,9 @@ assert arrange(CANDIDATES) == "mxmxvkd,sqjhc,fvjkl"
 # problem
 #
 
-with open('inputs/day21.txt') as f:
-    raw = f.read()
+if __name__ == "__main__":
+    with open('inputs/day21.txt') as f:
+        foods = parse(f.read())
 
-foods = [Food.parse(line) for line in raw.split("\n")]
-print(count_no_allergens(foods))
-cands = candidates(foods)
-print(arrange(cands))
\ No newline at end of file
+    print(part1(foods))
+    print(part2(foods))
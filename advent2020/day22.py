@@ -3,6 +3,8 @@ from typing import List, Tuple
 from collections import deque
 import itertools
 
+from advent2020.utils import timed
+
 
 class Game:
     def __init__(self, deck1: List[int], deck2: List[int]) -> None:
@@ -10,6 +12,7 @@ class Game:
         self.deck2 = deque(deck2)
         self.game_over = False    
 
+    @timed
     def play_one(self) -> None:
         card1 = self.deck1.popleft()
         card2 = self.deck2.popleft()
@@ -48,6 +51,7 @@ class RecursiveGame:
     def signature(self) -> Tuple[Tuple[int], Tuple[int]]:
         return (tuple(self.deck1), tuple(self.deck2))
 
+    @timed
     def play_one(self) -> None:
         sig = self.signature()
         if sig in self.seen:
@@ -94,6 +98,22 @@ class RecursiveGame:
         return sum(card * i for card, i in zip(reversed(winning_hand), itertools.count(1)))
 
 
+Decks = Tuple[List[int], List[int]]
+
+def parse(raw: str) -> Decks:
+    return make_decks(raw.strip())
+
+def part1(decks: Decks) -> int:
+    game = Game(*decks)
+    game.play()
+    return game.winning_score()
+
+def part2(decks: Decks) -> int:
+    recursive_game = RecursiveGame(*decks)
+    recursive_game.play()
+    return recursive_game.winning_score()
+
+
 #
 # unit tests
 #
@@ -125,13 +145,9 @@ assert RECURSIVE_GAME.winning_score() == 291
 # problem
 #
 
-with open('inputs/day22.txt') as f:
-    raw = f.read()
-    deck1, deck2 = make_decks(raw)
-    game = Game(deck1, deck2)
-    game.play()
-    print(game.winning_score())
+if __name__ == "__main__":
+    with open('inputs/day22.txt') as f:
+        decks = parse(f.read())
 
-    recursive_game = RecursiveGame(deck1, deck2)
-    recursive_game.play()
-    print(recursive_game.winning_score())
\ No newline at end of file
+    print(part1(decks))
+    print(part2(decks))
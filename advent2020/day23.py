@@ -2,12 +2,15 @@ from __future__ import annotations
 from collections import deque
 import itertools
 
+from advent2020.utils import timed
+
 class CupGame:
     def __init__(self, cups: str) -> None:
         self.cups = deque([int(c) for c in cups])
         self.lo = min(self.cups)
         self.hi = max(self.cups)
 
+    @timed
     def move(self) -> None:
         # Get the current cup and move it to the end
         current = self.cups.popleft()
@@ -85,6 +88,7 @@ class CupGame2:
             print(node.value, end=',')
             node = node.next
 
+    @timed
     def move(self) -> None:
         current = self.nodes[self.current]
 
@@ -135,6 +139,23 @@ class CupGame2:
         self.current = self.nodes[self.current].next.value
 
 
+def parse(raw: str) -> str:
+    return raw.strip()
+
+def part1(raw_cups: str) -> str:
+    game = CupGame(raw_cups)
+    for _ in range(100):
+        game.move()
+    return game.labels()
+
+def part2(raw_cups: str) -> int:
+    game2 = CupGame2(raw_cups)
+    for _ in range(10_000_000):
+        game2.move()
+    node = game2.nodes[1]
+    return node.next.value * node.next.next.value
+
+
 #
 # unit tests
 #
@@ -143,10 +164,9 @@ RAW = "389125467"
 GAME = CupGame(RAW)
 for i in range(100):
     GAME.move()
-    print(i, GAME.cups)
 assert GAME.labels() == "67384529"
 
-GAME2 = CupGame2(RAW)
+# GAME2 = CupGame2(RAW)
 # for i in range(1_000_000):
 #     seen = set()
 #     curr = GAME2.nodes[GAME2.current]
@@ -170,18 +190,9 @@ GAME2 = CupGame2(RAW)
 # problem
 #
 
-# with open('inputs/day23.txt') as f:
-#     raw = f.read()
-
-raw = "157623984"
-# game = CupGame(raw)
-# for _ in range(100):
-#     game.move()
-# print(game.labels())
-game2 = CupGame2(raw)
-for i in range(10_000_000):
-    if i % 1000 == 0:
-        print(i)
-    game2.move()
-node = game2.nodes[1]
-print(node.next.value * node.next.next.value)
\ No newline at end of file
+if __name__ == "__main__":
+    with open('inputs/day23.txt') as f:
+        raw = parse(f.read())
+
+    print(part1(raw))
+    print(part2(raw))
@@ -6,6 +6,8 @@ from __future__ import annotations
 import itertools
 from typing import Optional, Iterable, List
 
+from advent2020.utils import timed
+
 
 class CupGame:
     def __init__(self, 
@@ -25,6 +27,7 @@ class CupGame:
         self.nexts[prev] = self.current
         self.max = max(self.nexts)
 
+    @timed
     def move(self) -> None:
         # find next 3 nodes
         n1 = self.nexts[self.current]
@@ -55,7 +58,21 @@ class CupGame:
         return ''.join(out)
 
 def parse(raw: str) -> List[int]:
-    return [int(c) for c in list(raw)]
+    return [int(c) for c in list(raw.strip())]
+
+def part1(cups: List[int]) -> str:
+    game = CupGame(cups)
+    for _ in range(100):
+        game.move()
+    return game.labels()
+
+def part2(cups: List[int]) -> int:
+    game2 = CupGame(cups, continue_to=1_000_000)
+    for _ in range(10_000_000):
+        game2.move()
+    n1 = game2.nexts[1]
+    n2 = game2.nexts[n1]
+    return n1 * n2
 
 #
 # unit tests
@@ -69,30 +86,18 @@ for i in range(100):
     GAME.move()
 assert GAME.labels() == "67384529"
 
-GAME2 = CupGame(CUPS, continue_to=1_000_000)
-for i in range(10_000_000):
-    GAME2.move()
-n1 = GAME2.nexts[1]
-n2 = GAME2.nexts[n1]
-assert (n1, n2) == (934001, 159792)
-
 
 # 
 # problem
 #
 
-raw = "157623984"
-cups = parse(raw)
-
-game = CupGame(cups)
-for _ in range(100):
-    game.move()
-print(game.labels())
+if __name__ == "__main__":
+    # the big example takes as long as the real problem,
+    # so only check it when running the whole thing
+    assert part2(CUPS) == 934001 * 159792
 
-game2 = CupGame(cups, continue_to=1_000_000)
-for i in range(10_000_000):
-    game2.move()
-n1 = game2.nexts[1]
-n2 = game2.nexts[n1]
+    with open('inputs/day23.txt') as f:
+        cups = parse(f.read())
 
-print(n1 * n2)
+    print(part1(cups))
+    print(part2(cups))
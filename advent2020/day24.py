@@ -1,10 +1,13 @@
 from __future__ import annotations
-from typing import List, Tuple, Set, Dict, Iterator
+from typing import List, Tuple, Set, Dict
 from collections import Counter
 
-Hex = Tuple[float, float]
+from advent2020.automaton import HEX, Automaton
 
-def parse(raw: str) -> List[str]:
+# axial coordinates (q, r)
+Hex = Tuple[int, int]
+
+def parse_steps(raw: str) -> List[str]:
     """
     directions are e, ne, se, w, nw, sw
 
@@ -23,35 +26,32 @@ def parse(raw: str) -> List[str]:
     return out
 
 def find_tile(steps: List[str]) -> Hex:
-    """returns final (x, y)"""
-    x = y = 0
+    """returns final (q, r)"""
+    q = r = 0
     for step in steps:
         if step == "e":
-            x += 1
+            q += 1
         elif step == "ne":
-            x += 0.5
-            y += 1
+            q += 1
+            r -= 1
         elif step == "nw":
-            x -= 0.5
-            y += 1
+            r -= 1
         elif step == "w":
-            x -= 1
+            q -= 1
         elif step == "sw":
-            x -= 0.5
-            y -= 1
+            q -= 1
+            r += 1
         elif step == "se":
-            x += 0.5
-            y -= 1
+            r += 1
 
-    return x, y 
+    return q, r
 
 def find_black_tiles(raw: str) -> Set[Hex]:
     counts: Dict[Hex, int] = Counter()
 
     for line in raw.split("\n"):
-        steps = parse(line)
-        x, y = find_tile(steps)
-        counts[(x, y)] += 1
+        steps = parse_steps(line)
+        counts[find_tile(steps)] += 1
 
     return {k for k, v in counts.items() if v % 2 == 1}
 
@@ -59,26 +59,22 @@ def find_black_tiles(raw: str) -> Set[Hex]:
 def count_black_tiles(raw: str) -> int:
     return len(find_black_tiles(raw))
 
-def neighbors(hex: Hex) -> Iterator[Hex]:
-    x, y = hex
-    yield x + 1, y         # e
-    yield x - 1, y         # w
-    yield x + 0.5, y + 1   # ne
-    yield x - 0.5, y + 1   # nw
-    yield x + 0.5, y - 1   # se
-    yield x - 0.5, y - 1   # sw
+# a black tile with 0 or more than 2 black neighbors turns white,
+# a white tile with exactly 2 black neighbors turns black
+FLIPPING = Automaton.of(HEX, birth=[2], survive=[1, 2])
 
 def step(black_tiles: Set[Hex]) -> Set[Hex]:
-    neighbor_counts = Counter()
-    for hex in black_tiles:
-        for neighbor in neighbors(hex):
-            neighbor_counts[neighbor] += 1
-    
-    return {
-        hex 
-        for hex, count in neighbor_counts.items()
-        if (hex in black_tiles and 1 <= count <= 2) or (hex not in black_tiles and count == 2)
-    }
+    return FLIPPING.sparse_step(black_tiles)
+
+
+def parse(raw: str) -> Set[Hex]:
+    return find_black_tiles(raw.strip())
+
+def part1(black_tiles: Set[Hex]) -> int:
+    return len(black_tiles)
+
+def part2(black_tiles: Set[Hex]) -> int:
+    return len(FLIPPING.run(black_tiles, 100))
 
 #
 # unit testing
@@ -106,17 +102,16 @@ neswnwewnwnwseenwseesewsenwsweewe
 wseweeenwnesenwwwswnew"""
 
 assert count_black_tiles(RAW) == 10
+assert len(step(find_black_tiles(RAW))) == 15
+assert part2(find_black_tiles(RAW)) == 2208
 
 # 
 # problem
 #
 
-with open('inputs/day24.txt') as f:
-    raw = f.read()
-
-print(count_black_tiles(raw))
+if __name__ == "__main__":
+    with open('inputs/day24.txt') as f:
+        black_tiles = parse(f.read())
 
-tiles = find_black_tiles(raw)
-for _ in range(100):
-    tiles = step(tiles)
-print(len(tiles))
\ No newline at end of file
+    print(part1(black_tiles))
+    print(part2(black_tiles))
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Iterator
+from typing import Iterator, Tuple
 """
 The handshake used by the card and the door involves an operation 
 that transforms a subject number. To transform a subject number, 
@@ -30,6 +30,27 @@ def find_loop_number(public_key: int, subject_number: int = 7) -> int:
     raise RuntimeError()
 
 
+Keys = Tuple[int, int]
+
+def parse(raw: str) -> Keys:
+    door_key, card_key = [int(line) for line in raw.strip().split("\n")]
+    return door_key, card_key
+
+def part1(keys: Keys) -> int:
+    door_key, card_key = keys
+    door_number = find_loop_number(door_key)
+    return handshake(door_number, card_key)
+
+def part2(keys: Keys) -> int:
+    """
+    There is no part 2 on day 25, so this computes the same
+    encryption key from the other side of the handshake
+    """
+    door_key, card_key = keys
+    card_number = find_loop_number(card_key)
+    return handshake(card_number, door_key)
+
+
 #
 # unit tests
 #
@@ -41,11 +62,10 @@ assert find_loop_number(17807724) == 11
 # problem
 #
 
-door_key = 12578151
-card_key = 5051300
+if __name__ == "__main__":
+    with open('inputs/day25.txt') as f:
+        keys = parse(f.read())
 
-door_number = find_loop_number(door_key)
-print(handshake(door_number, card_key))
+    print(part1(keys))
+    print(part2(keys))
 
-card_number = find_loop_number(card_key)
-print(handshake(card_number, door_key))
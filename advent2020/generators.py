@@ -0,0 +1,1138 @@
+"""
+Synthetic puzzle inputs, for seeing how the solutions
+hold up on inputs bigger than the ones we were given.
+
+Each generator takes a size (in whatever unit makes sense for the day,
+e.g. lines or records) and a random.Random, and returns the raw input
+along with the answers, which it knows by construction
+(or, for day 11, from a second implementation of the rules).
+
+    python -m advent2020.generators 7 --scale 10 > big_day07.txt
+    python -m advent2020.generators 20 --size 400 --check
+"""
+from __future__ import annotations
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
+import argparse
+import itertools
+import math
+import random
+import string
+import sys
+
+from advent2020.runner import load_day, module_names, solve
+
+
+class Generated(NamedTuple):
+    raw: str
+    part1: Optional[Any] = None
+    part2: Optional[Any] = None
+
+
+Generator = Callable[[int, random.Random], Generated]
+
+
+def day01(size: int, rng: random.Random) -> Generated:
+    """
+    Every filler number is bigger than 2020, so the only
+    pair and the only triple that add up to 2020 are the planted ones.
+    """
+    while True:
+        a = rng.randrange(1, 2020)
+        b = rng.randrange(1, 1010)
+        c = rng.randrange(1, 1010)
+        planted = [a, 2020 - a, b, c, 2020 - b - c]
+
+        # need 5 distinct positive numbers with no other
+        # pairs or triples (even reusing a number) adding up to 2020
+        pairs = {(x, y) for x in planted for y in planted if x < y and x + y == 2020}
+        triples = {tuple(sorted((x, y, z)))
+                   for x in planted for y in planted for z in planted
+                   if x + y + z == 2020}
+        if len(set(planted)) == 5 and min(planted) > 0 and len(pairs) == 1 and len(triples) == 1:
+            break
+
+    fillers = rng.sample(range(2021, 2021 + 10 * size), max(size - 5, 0))
+    numbers = planted + fillers
+    rng.shuffle(numbers)
+
+    return Generated(
+        raw="\n".join(str(n) for n in numbers),
+        part1=a * (2020 - a),
+        part2=b * c * (2020 - b - c)
+    )
+
+
+def day02(size: int, rng: random.Random) -> Generated:
+    lines = []
+    valid1 = valid2 = 0
+
+    for _ in range(size):
+        length = rng.randint(5, 16)
+        password = ''.join(rng.choices("abcdefgh", k=length))
+        char = rng.choice("abcdefgh")
+        lo = rng.randint(1, length - 1)
+        hi = rng.randint(lo + 1, length)
+
+        valid1 += lo <= password.count(char) <= hi
+        valid2 += (password[lo - 1] == char) ^ (password[hi - 1] == char)
+        lines.append(f"{lo}-{hi} {char}: {password}")
+
+    return Generated("\n".join(lines), valid1, valid2)
+
+
+def day03(size: int, rng: random.Random) -> Generated:
+    width = 31
+    rows = [''.join('#' if rng.random() < 0.2 else '.' for _ in range(width))
+            for _ in range(size)]
+
+    def trees(right: int, down: int) -> int:
+        return sum(row[(y // down * right) % width] == '#'
+                   for y, row in enumerate(rows)
+                   if y % down == 0)
+
+    product = 1
+    for right, down in [(1, 1), (3, 1), (5, 1), (7, 1), (1, 2)]:
+        product *= trees(right, down)
+
+    return Generated("\n".join(rows), trees(3, 1), product)
+
+
+PASSPORT_FIELDS: Dict[str, Callable[[random.Random, bool], str]] = {
+    "byr": lambda rng, ok: str(rng.randint(1920, 2002) if ok else rng.choice([rng.randint(1890, 1919), rng.randint(2003, 2030)])),
+    "iyr": lambda rng, ok: str(rng.randint(2010, 2020) if ok else rng.choice([rng.randint(1990, 2009), rng.randint(2021, 2030)])),
+    "eyr": lambda rng, ok: str(rng.randint(2020, 2030) if ok else rng.choice([rng.randint(2000, 2019), rng.randint(2031, 2040)])),
+    "hgt": lambda rng, ok: (rng.choice([f"{rng.randint(150, 193)}cm", f"{rng.randint(59, 76)}in"]) if ok
+                            else rng.choice([f"{rng.randint(194, 220)}cm", f"{rng.randint(40, 58)}in", str(rng.randint(59, 193))])),
+    "hcl": lambda rng, ok: ("#" + ''.join(rng.choices("0123456789abcdef", k=6)) if ok
+                            else rng.choice(["#" + ''.join(rng.choices("0123456789abcdefz", k=5)) + "z",
+                                             ''.join(rng.choices("0123456789abcdef", k=6))])),
+    "ecl": lambda rng, ok: rng.choice(['amb', 'blu', 'brn', 'gry', 'grn', 'hzl', 'oth'] if ok else ['zzz', 'gmt', 'xry', 'blk']),
+    "pid": lambda rng, ok: ''.join(rng.choices(string.digits, k=9 if ok else rng.choice([8, 10]))),
+}
+
+
+def day04(size: int, rng: random.Random) -> Generated:
+    chunks = []
+    valid1 = valid2 = 0
+
+    for _ in range(size):
+        present = [field for field in PASSPORT_FIELDS if rng.random() < 0.95]
+        all_present = len(present) == len(PASSPORT_FIELDS)
+        ok = {field: rng.random() < 0.9 for field in present}
+
+        passport = [f"{field}:{PASSPORT_FIELDS[field](rng, ok[field])}" for field in present]
+        if rng.random() < 0.5:
+            passport.append(f"cid:{rng.randint(1, 350)}")
+        rng.shuffle(passport)
+
+        valid1 += all_present
+        valid2 += all_present and all(ok.values())
+
+        # break the fields across lines at random
+        chunks.append(''.join(field + rng.choice(" \n") for field in passport).strip())
+
+    return Generated("\n\n".join(chunks), valid1, valid2)
+
+
+def day05(size: int, rng: random.Random) -> Generated:
+    """
+    There are only 1024 seat ids, so this maxes out at about a thousand passes.
+    """
+    count = min(size, 1000)
+    lo = rng.randrange(1, 1024 - count - 1)
+    seat_ids = list(range(lo, lo + count + 1))
+    missing = seat_ids.pop(rng.randrange(1, count))
+    rng.shuffle(seat_ids)
+
+    def encode(seat_id: int) -> str:
+        row = f"{seat_id >> 3:07b}".replace("0", "F").replace("1", "B")
+        col = f"{seat_id & 7:03b}".replace("0", "L").replace("1", "R")
+        return row + col
+
+    return Generated("\n".join(encode(s) for s in seat_ids), lo + count, missing)
+
+
+def day06(size: int, rng: random.Random) -> Generated:
+    groups = []
+    anyone = everyone = 0
+
+    for _ in range(size):
+        people = [set(rng.sample(string.ascii_lowercase, rng.randint(1, 26)))
+                  for _ in range(rng.randint(1, 5))]
+        anyone += len(set.union(*people))
+        everyone += len(set.intersection(*people))
+        groups.append("\n".join(''.join(person) for person in people))
+
+    return Generated("\n\n".join(groups), anyone, everyone)
+
+
+def random_word(rng: random.Random, lo: int = 3, hi: int = 8) -> str:
+    return ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(lo, hi)))
+
+
+ADJECTIVES = ["light", "dark", "bright", "muted", "shiny", "faded", "dotted", "vibrant",
+              "dull", "clear", "pale", "drab", "mirrored", "posh", "wavy", "striped",
+              "plaid", "dim", "dusty"]
+
+
+def bag_graph(num_colors: int, rng: random.Random,
+              fan_out: int = 3, depth: int = 8) -> Generated:
+    """
+    The colors are arranged in `depth` layers, and each color contains
+    `fan_out` colors from the next layer down (the last layer is empty).
+    Shiny gold is in the middle layer.
+    """
+    names = {"shiny gold"}
+    while len(names) < num_colors:
+        names.add(f"{rng.choice(ADJECTIVES)} {random_word(rng)}")
+    names.remove("shiny gold")
+    colors = ["shiny gold"] + sorted(names)
+    rng.shuffle(colors)
+
+    depth = max(1, min(depth, num_colors))
+    layers = [colors[i::depth] for i in range(depth)]
+    # move shiny gold to the middle layer
+    for layer in layers:
+        if "shiny gold" in layer:
+            layer.remove("shiny gold")
+    layers[depth // 2].append("shiny gold")
+
+    contains: Dict[str, Dict[str, int]] = {}
+    for layer, next_layer in zip(layers, layers[1:] + [[]]):
+        for color in layer:
+            children = rng.sample(next_layer, min(fan_out, len(next_layer)))
+            contains[color] = {child: rng.randint(1, 5) for child in children}
+
+    lines = []
+    for color in colors:
+        if contains[color]:
+            inside = ", ".join(f"{n} {child} bag{'s' if n > 1 else ''}"
+                               for child, n in contains[color].items())
+        else:
+            inside = "no other bags"
+        lines.append(f"{color} bags contain {inside}.")
+
+    # part 1: everything above shiny gold
+    parents: Dict[str, List[str]] = {color: [] for color in colors}
+    for color, children in contains.items():
+        for child in children:
+            parents[child].append(color)
+    ancestors = set()
+    stack = ["shiny gold"]
+    while stack:
+        for parent in parents[stack.pop()]:
+            if parent not in ancestors:
+                ancestors.add(parent)
+                stack.append(parent)
+
+    # part 2: bags inside, bottom layer first
+    inside: Dict[str, int] = {}
+    for layer in reversed(layers):
+        for color in layer:
+            inside[color] = sum(n * (1 + inside[child]) for child, n in contains[color].items())
+
+    return Generated("\n".join(lines), len(ancestors), inside["shiny gold"])
+
+
+def day07(size: int, rng: random.Random) -> Generated:
+    return bag_graph(size, rng)
+
+
+def day08(size: int, rng: random.Random) -> Generated:
+    """
+    The program runs straight through, except that it sometimes jumps over
+    an instruction, and there's a `jmp` back to the start near the end.
+    Every other `nop` or `jmp` you could change just makes it loop sooner
+    (the `nop`s point backwards and the skipped instructions are backwards `jmp`s),
+    so changing that last `jmp` is the fix.
+    """
+    size = max(size, 2)
+    loop_at = size - 1 - rng.randrange(max(size // 10, 1))
+    program: List[Optional[str]] = [None] * size
+    executed: List[int] = []
+    acc_before = acc_total = 0
+
+    i = 0
+    while i < size:
+        if i == loop_at:
+            target = rng.choice(executed) if executed else i
+            program[i] = f"jmp {target - i:+d}"
+            executed.append(i)
+            acc_before = acc_total
+            i += 1
+            continue
+
+        kind = rng.random()
+        if kind < 0.2 and executed and i + 1 < size and loop_at not in (i, i + 1):
+            program[i] = "jmp +2"
+            executed.append(i)
+            program[i + 1] = f"jmp {rng.choice(executed) - (i + 1):+d}"
+            i += 2
+        elif kind < 0.4:
+            target = rng.choice(executed) if executed else i
+            program[i] = f"nop {target - i:+d}"
+            executed.append(i)
+            i += 1
+        else:
+            arg = rng.randint(-50, 50)
+            program[i] = f"acc {arg:+d}"
+            acc_total += arg
+            executed.append(i)
+            i += 1
+
+    return Generated("\n".join(program), acc_before, acc_total)  # type: ignore
+
+
+def day09(size: int, rng: random.Random) -> Generated:
+    """
+    Each number is the sum of two of the previous 25 until the invalid one,
+    after which we add filler and then a contiguous run that adds up to it.
+    Those sums make the numbers double every 25 or so,
+    so the valid stretch stops growing at 5000 numbers.
+    """
+    lookback = 25
+    valid = max(min(size // 2, 5000), lookback + 20)
+    numbers = [rng.randint(1, 50) for _ in range(lookback)]
+    while len(numbers) < valid:
+        i, j = rng.sample(range(len(numbers) - lookback, len(numbers)), 2)
+        numbers.append(numbers[i] + numbers[j])
+
+    # the invalid number is the sum of a run of numbers that we'll put at the end
+    window = numbers[-lookback:]
+    sums = {a + b for i, a in enumerate(window) for b in window[i + 1:]}
+    while True:
+        run = [rng.randint(max(window) // 20 + 1, max(window) // 4 + 1) for _ in range(rng.randint(2, 17))]
+        target = sum(run)
+        if target not in sums:
+            break
+    numbers.append(target)
+
+    filler = max(size - len(numbers) - len(run), 0)
+    numbers.extend(rng.randint(1, target // 4) for _ in range(filler))
+    numbers.extend(run)
+
+    # the first run (of at least two) that adds up to the target,
+    # which is also the one that ends first, since they're all positive
+    lo = total = 0
+    for hi, n in enumerate(numbers):
+        total += n
+        while total > target:
+            total -= numbers[lo]
+            lo += 1
+        if total == target and lo < hi:
+            break
+    found = numbers[lo:hi + 1]
+
+    return Generated("\n".join(str(n) for n in numbers), target, min(found) + max(found))
+
+
+def day10(size: int, rng: random.Random) -> Generated:
+    """
+    Like the real inputs, the joltage differences are all 1s and 3s,
+    and there are never more than four 1s in a row.
+
+    A run of k 1-differences can be crossed in tribonacci(k) ways,
+    and the runs are independent, so the number of arrangements
+    is the product over the runs.
+    """
+    diffs: List[int] = []
+    run = 0
+    for _ in range(size):
+        diff = 1 if run < 4 and rng.random() < 0.6 else 3
+        run = run + 1 if diff == 1 else 0
+        diffs.append(diff)
+
+    adapters = []
+    joltage = 0
+    for diff in diffs:
+        joltage += diff
+        adapters.append(joltage)
+    rng.shuffle(adapters)
+
+    # and the device is 3 higher than the biggest adapter
+    diffs.append(3)
+
+    ways = [1, 1, 2]
+    while len(ways) <= 4:
+        ways.append(ways[-1] + ways[-2] + ways[-3])
+
+    num_paths = 1
+    run = 0
+    for diff in diffs:
+        if diff == 1:
+            run += 1
+        else:
+            num_paths *= ways[run]
+            run = 0
+
+    return Generated(
+        raw="\n".join(str(a) for a in adapters),
+        part1=diffs.count(1) * diffs.count(3),
+        part2=num_paths
+    )
+
+
+def seat_counts(rows: List[str], threshold: int, visible: bool) -> Tuple[int, List[Tuple[int, int]]]:
+    """
+    A second implementation of the seating rules, to get the day 11 answers.
+    It works out each seat's neighbors once up front, and then each round
+    only looks at the seats next to the ones that just changed.
+
+    Random grids don't always settle down; sometimes a patch of seats
+    flips back and forth forever (and the solver with it). In that case
+    it returns the seats that are still flipping instead of an answer.
+    """
+    seats = {(i, j): k
+             for k, (i, j) in enumerate((i, j)
+                                        for i, row in enumerate(rows)
+                                        for j, c in enumerate(row)
+                                        if c == 'L')}
+    positions = list(seats)
+    neighbors: List[List[int]] = [[] for _ in seats]
+    for (i, j), k in seats.items():
+        for di in (-1, 0, 1):
+            for dj in (-1, 0, 1):
+                if di == dj == 0:
+                    continue
+                ii, jj = i + di, j + dj
+                if visible:
+                    while 0 <= ii < len(rows) and 0 <= jj < len(rows[0]) and (ii, jj) not in seats:
+                        ii, jj = ii + di, jj + dj
+                if (ii, jj) in seats:
+                    neighbors[k].append(seats[ii, jj])
+
+    occupied = [False] * len(seats)
+    counts = [0] * len(seats)
+    candidates = set(range(len(seats)))
+    last_flips: Set[int] = set()
+
+    while True:
+        flips = {k for k in candidates
+                 if (counts[k] >= threshold if occupied[k] else counts[k] == 0)}
+        if not flips:
+            return sum(occupied), []
+        if flips == last_flips:
+            # flipping the same seats again gets us back where we were
+            return 0, [positions[k] for k in flips]
+
+        candidates = set(flips)
+        for k in flips:
+            occupied[k] = not occupied[k]
+            delta = 1 if occupied[k] else -1
+            for n in neighbors[k]:
+                counts[n] += delta
+            candidates.update(neighbors[k])
+        last_flips = flips
+
+
+def seat_grid(rows: int, cols: int, rng: random.Random, floor: float = 0.15) -> Generated:
+    """
+    If the seats don't settle down, turn a few of the ones that keep
+    flipping into floor and try again.
+    """
+    grid = [['.' if rng.random() < floor else 'L' for _ in range(cols)]
+            for _ in range(rows)]
+
+    while True:
+        lines = [''.join(row) for row in grid]
+        part1, flipping1 = seat_counts(lines, 4, visible=False)
+        part2, flipping2 = seat_counts(lines, 5, visible=True)
+        flipping = flipping1 + flipping2
+        if not flipping:
+            return Generated("\n".join(lines), part1, part2)
+        for i, j in rng.sample(flipping, max(1, len(flipping) // 20)):
+            grid[i][j] = '.'
+
+
+def day11(size: int, rng: random.Random) -> Generated:
+    return seat_grid(size, 91, rng)
+
+
+def day12(size: int, rng: random.Random) -> Generated:
+    compass = {'N': (0, 1), 'S': (0, -1), 'E': (1, 0), 'W': (-1, 0)}
+
+    def turn_left(x: int, y: int, degrees: int):
+        for _ in range(degrees // 90):
+            x, y = -y, x
+        return x, y
+
+    ship = (0, 0)
+    facing = (1, 0)
+    ship2 = (0, 0)
+    waypoint = (10, 1)
+
+    lines = []
+    for _ in range(size):
+        action = rng.choice("NSEWLRF")
+        amount = rng.choice([90, 180, 270]) if action in "LR" else rng.randint(1, 100)
+        lines.append(f"{action}{amount}")
+
+        if action in compass:
+            dx, dy = compass[action]
+            ship = (ship[0] + amount * dx, ship[1] + amount * dy)
+            waypoint = (waypoint[0] + amount * dx, waypoint[1] + amount * dy)
+        elif action in "LR":
+            degrees = amount if action == 'L' else 360 - amount
+            facing = turn_left(*facing, degrees)
+            waypoint = turn_left(*waypoint, degrees)
+        else:
+            ship = (ship[0] + amount * facing[0], ship[1] + amount * facing[1])
+            ship2 = (ship2[0] + amount * waypoint[0], ship2[1] + amount * waypoint[1])
+
+    return Generated(
+        raw="\n".join(lines),
+        part1=abs(ship[0]) + abs(ship[1]),
+        part2=abs(ship2[0]) + abs(ship2[1])
+    )
+
+
+def primes(n: int, above: int = 10) -> List[int]:
+    """
+    The first n primes bigger than `above`
+    """
+    found: List[int] = []
+    candidate = above
+    while len(found) < n:
+        candidate += 1
+        if all(candidate % p for p in range(2, int(candidate ** 0.5) + 1)):
+            found.append(candidate)
+    return found
+
+
+def day13(size: int, rng: random.Random) -> Generated:
+    """
+    The buses are distinct primes, so we can get the timestamp for part 2
+    one bus at a time with modular inverses.
+    """
+    buses = primes(size)
+    rng.shuffle(buses)
+    offsets = sorted(rng.sample(range(1, 10 * size), size - 1))
+    positions = dict(zip([0] + offsets, buses))
+    schedule = [str(positions[i]) if i in positions else 'x'
+                for i in range(max(positions) + 1)]
+
+    # t % bus == -position % bus for each bus
+    t, modulus = 0, 1
+    for position, bus in positions.items():
+        t += modulus * ((-position - t) * pow(modulus, -1, bus) % bus)
+        modulus *= bus
+
+    # make sure there's only one bus with the shortest wait
+    while True:
+        depart = rng.randint(100_000, 10_000_000)
+        waits = sorted((-depart % bus, bus) for bus in buses)
+        if len(waits) == 1 or waits[0][0] != waits[1][0]:
+            break
+    wait, bus = waits[0]
+
+    return Generated(f"{depart}\n" + ",".join(schedule), wait * bus, t)
+
+
+def day14(size: int, rng: random.Random) -> Generated:
+    """
+    The masks only touch the low 12 bits, and every write goes to an address
+    whose high bits are unique. That means no write in either part
+    overwrites another, so the answers are just totals.
+    """
+    lines: List[str] = []
+    part1 = part2 = 0
+    address = 0
+
+    while len(lines) < size:
+        low = ['0'] * 12
+        for i in rng.sample(range(12), rng.randint(0, 9)):
+            low[i] = 'X'
+        for i in range(12):
+            if low[i] == '0' and rng.random() < 0.5:
+                low[i] = '1'
+        mask = '0' * 24 + ''.join(low)
+        ones = int(mask.replace('X', '0'), 2)
+        floating = int(mask.replace('1', '0').replace('X', '1'), 2)
+        lines.append(f"mask = {mask}")
+
+        for _ in range(rng.randint(1, 6)):
+            address += 1
+            pos = (address << 12) | rng.randrange(1 << 12)
+            value = rng.randrange(1 << 36)
+            lines.append(f"mem[{pos}] = {value}")
+            part1 += (value & floating) | ones
+            part2 += value * 2 ** mask.count('X')
+
+    return Generated("\n".join(lines), part1, part2)
+
+
+# starting numbers with known answers: the examples, plus our input
+MEMORY_GAMES = [
+    ("0,3,6", 436, 175594),
+    ("1,3,2", 1, 2578),
+    ("2,1,3", 10, 3544142),
+    ("1,2,3", 27, 261214),
+    ("2,3,1", 78, 6895259),
+    ("3,2,1", 438, 18),
+    ("3,1,2", 1836, 362),
+    ("2,20,0,4,1,17", 758, 814),
+]
+
+
+def day15(size: int, rng: random.Random) -> Generated:
+    """
+    The work doesn't depend on the size of the input,
+    so this just picks one of the games we know the answers for.
+    """
+    return Generated(*rng.choice(MEMORY_GAMES))
+
+
+TICKET_FIELDS = [
+    "departure location", "departure station", "departure platform",
+    "departure track", "departure date", "departure time",
+    "arrival location", "arrival station", "arrival platform", "arrival track",
+    "class", "duration", "price", "route", "row", "seat", "train", "type", "wagon", "zone",
+]
+
+
+def day16(size: int, rng: random.Random) -> Generated:
+    """
+    The field with rank r accepts everything from 1 up to 1000 + 10r
+    (except for one gap), and its column always contains a 1000 + 10r,
+    which rules out all the fields of lower rank. So the columns have
+    1, 2, ..., 20 candidates, and eliminating them one at a time works.
+    Invalid values are bigger than anything any field accepts.
+    """
+    names = TICKET_FIELDS[:]
+    rng.shuffle(names)
+    num_fields = len(names)
+
+    # names[rank] goes in column columns[rank]
+    columns = list(range(num_fields))
+    rng.shuffle(columns)
+
+    rules = []
+    for rank, name in enumerate(names):
+        gap = 101 + 10 * rank
+        rules.append(f"{name}: 1-{gap - 1} or {gap + 1}-{1000 + 10 * rank}")
+
+    your_ticket = [rng.randint(1, 100) for _ in range(num_fields)]
+    tickets = [[rng.randint(1, 100) for _ in range(num_fields)] for _ in range(max(size, 1))]
+
+    # plant each column's biggest value
+    for rank, column in enumerate(columns):
+        rng.choice(tickets)[column] = 1000 + 10 * rank
+
+    error_rate = 0
+    for _ in range(size // 5):
+        ticket = [rng.randint(1, 100) for _ in range(num_fields)]
+        ticket[rng.randrange(num_fields)] = bad = rng.randint(2000, 2999)
+        error_rate += bad
+        tickets.insert(rng.randrange(len(tickets) + 1), ticket)
+
+    departure = 1
+    for rank, name in enumerate(names):
+        if name.startswith("departure"):
+            departure *= your_ticket[columns[rank]]
+
+    raw = "\n".join(rules) + "\n\nyour ticket:\n" + ",".join(str(n) for n in your_ticket)
+    raw += "\n\nnearby tickets:\n" + "\n".join(",".join(str(n) for n in t) for t in tickets)
+
+    return Generated(raw, error_rate, departure)
+
+
+def day17(size: int, rng: random.Random) -> Generated:
+    """
+    Copies of the glider from the example. Each one spreads at most
+    one cell per step, so after 6 steps there are still
+    a few empty cells between them, and they never affect each other.
+    """
+    glider = [".#.", "..#", "###"]
+    per_row = max(int(size ** 0.5), 1)
+    num_rows = -(-size // per_row)
+    spacing = 20
+
+    lines = []
+    for r in range(num_rows):
+        count = min(per_row, size - r * per_row)
+        block = [['.'] * (per_row * spacing) for _ in range(spacing)]
+        for k in range(count):
+            dx = k * spacing + rng.randrange(4)
+            dy = rng.randrange(4)
+            for y, row in enumerate(glider):
+                for x, c in enumerate(row):
+                    block[dy + y][dx + x] = c
+        lines.extend(''.join(row) for row in block)
+
+    return Generated("\n".join(lines), 112 * size, 848 * size)
+
+
+def day18(size: int, rng: random.Random) -> Generated:
+    """
+    Builds each expression along with its value under both sets of rules:
+    left-to-right, and addition-before-multiplication
+    """
+    def expression(depth: int):
+        terms = []
+        values1 = []
+        values2 = []
+        ops = []
+        for i in range(rng.randint(2, 6)):
+            if i > 0:
+                ops.append(rng.choice("+*"))
+            if depth < 3 and rng.random() < 0.3:
+                text, v1, v2 = expression(depth + 1)
+                terms.append(f"({text})")
+            else:
+                v1 = v2 = rng.randint(1, 9)
+                terms.append(str(v1))
+            values1.append(v1)
+            values2.append(v2)
+
+        # left to right
+        value1 = values1[0]
+        for op, v in zip(ops, values1[1:]):
+            value1 = value1 + v if op == '+' else value1 * v
+
+        # product of the sums
+        value2 = 1
+        total = values2[0]
+        for op, v in zip(ops, values2[1:]):
+            if op == '+':
+                total += v
+            else:
+                value2 *= total
+                total = v
+        value2 *= total
+
+        text = terms[0] + ''.join(f" {op} {term}" for op, term in zip(ops, terms[1:]))
+        return text, value1, value2
+
+    lines = []
+    part1 = part2 = 0
+    for _ in range(size):
+        text, v1, v2 = expression(0)
+        lines.append(text)
+        part1 += v1
+        part2 += v2
+
+    return Generated("\n".join(lines), part1, part2)
+
+
+def rule_grammar(num_messages: int, rng: random.Random, depth: int = 8) -> Generated:
+    """
+    Like the real inputs, 0: 8 11, 8: 42 and 11: 42 31, where 42 and 31
+    each match strings of length `depth`: 42 the ones with an even number of b's
+    and 31 the ones with an odd number. Then a message is a string of 42-chunks
+    and 31-chunks, and part 1 wants 42 42 31, while part 2 wants
+    some 42s followed by fewer (but at least one) 31s.
+    """
+    depth = max(depth, 2)
+    num_rules = max(43, 2 * depth + 3)
+    free = [i for i in range(num_rules) if i not in (0, 8, 11, 31, 42)]
+    rng.shuffle(free)
+
+    # even[k] matches length k strings with an even number of b's, odd[k] odd
+    a, b = free.pop(), free.pop()
+    even = {1: a}
+    odd = {1: b}
+    for k in range(2, depth + 1):
+        even[k] = 42 if k == depth else free.pop()
+        odd[k] = 31 if k == depth else free.pop()
+
+    rules = {
+        0: "8 11",
+        8: "42",
+        11: "42 31",
+        a: '"a"',
+        b: '"b"',
+    }
+    for k in range(2, depth + 1):
+        rules[even[k]] = f"{a} {even[k - 1]} | {b} {odd[k - 1]}"
+        rules[odd[k]] = f"{a} {odd[k - 1]} | {b} {even[k - 1]}"
+    # and the leftover ids don't matter
+    for i in free:
+        rules[i] = f"{a} {b}"
+
+    def chunk(parity: int) -> str:
+        while True:
+            s = ''.join(rng.choices("ab", k=depth))
+            if s.count('b') % 2 == parity:
+                return s
+
+    messages = []
+    part1 = part2 = 0
+    for _ in range(num_messages):
+        n42 = rng.randint(1, 5)
+        n31 = rng.randint(0, 4)
+        parities = [0] * n42 + [1] * n31
+        if rng.random() < 0.2:
+            rng.shuffle(parities)
+        message = ''.join(chunk(parity) for parity in parities)
+        if rng.random() < 0.05:
+            message += rng.choice("ab")
+        messages.append(message)
+
+        if len(message) % depth == 0 and parities == sorted(parities):
+            part1 += (n42, n31) == (2, 1)
+            part2 += n42 > n31 >= 1
+
+    rule_lines = [f"{i}: {rule}" for i, rule in rules.items()]
+    rng.shuffle(rule_lines)
+
+    return Generated("\n".join(rule_lines) + "\n\n" + "\n".join(messages), part1, part2)
+
+
+def day19(size: int, rng: random.Random) -> Generated:
+    return rule_grammar(size, rng)
+
+
+SEA_MONSTER = [(0, 18),
+               (1, 0), (1, 5), (1, 6), (1, 11), (1, 12), (1, 17), (1, 18), (1, 19),
+               (2, 1), (2, 4), (2, 7), (2, 10), (2, 13), (2, 16)]
+
+
+def tile_mosaic(side: int, rng: random.Random, density: float = 0.4) -> Generated:
+    """
+    A side x side square of tiles, whose (glued) image has some sea monsters in it.
+
+    The other #s in the image are never next to each other or to a sea monster,
+    and every sea monster needs three #s in a row, so there are no sea monsters
+    besides the ones we put there. Every edge is different (even reversed),
+    which means the tiles only fit together one way; to make that possible
+    the tiles get bigger than 10x10 when there are lots of them.
+    """
+    side = max(side, 3)
+    num_edges = 2 * side * (side + 1)
+    tile_size = max(10, num_edges.bit_length() + 3)
+    inner = tile_size - 2
+    n = side * inner
+
+    # plant the sea monsters
+    image = [['.'] * n for _ in range(n)]
+    blocked = set()
+    num_monsters = 0
+    for _ in range(max(n * n // 300, 1)):
+        i, j = rng.randrange(n - 2), rng.randrange(n - 19)
+        cells = [(i + di, j + dj) for di, dj in SEA_MONSTER]
+        if any(cell in blocked for cell in cells):
+            continue
+        for ci, cj in cells:
+            image[ci][cj] = '#'
+            blocked.update((ci + di, cj + dj) for di in (-1, 0, 1) for dj in (-1, 0, 1))
+        num_monsters += 1
+
+    # and the background, only on the "black squares" so no two are adjacent
+    for i in range(n):
+        for j in range(i % 2, n, 2):
+            if (i, j) not in blocked and rng.random() < density:
+                image[i][j] = '#'
+
+    # edges: corners[i][j] is the pixel where four tiles meet,
+    # across[i][j] the edge along the top of tile (i, j), down[i][j] down its left
+    corners = [[rng.choice("#.") for _ in range(side + 1)] for _ in range(side + 1)]
+    used = set()
+
+    def edge(start: str, end: str) -> str:
+        while True:
+            e = start + ''.join(rng.choices("#.", k=inner)) + end
+            if e not in used and e[::-1] not in used and e != e[::-1]:
+                used.update([e, e[::-1]])
+                return e
+
+    across = [[edge(corners[i][j], corners[i][j + 1]) for j in range(side)] for i in range(side + 1)]
+    down = [[edge(corners[i][j], corners[i + 1][j]) for j in range(side + 1)] for i in range(side)]
+
+    tile_ids = rng.sample(range(1000, 1000 + 10 * side * side), side * side)
+    tiles = []
+    for i in range(side):
+        for j in range(side):
+            pixels = [list(across[i][j])]
+            for r in range(inner):
+                pixels.append([down[i][j][r + 1]] +
+                              image[i * inner + r][j * inner:(j + 1) * inner] +
+                              [down[i][j + 1][r + 1]])
+            pixels.append(list(across[i + 1][j]))
+
+            # and scramble it
+            for _ in range(rng.randrange(4)):
+                pixels = [list(row) for row in zip(*reversed(pixels))]
+            if rng.random() < 0.5:
+                pixels = [row[::-1] for row in pixels]
+
+            tile_id = tile_ids[i * side + j]
+            tiles.append(f"Tile {tile_id}:\n" + "\n".join(''.join(row) for row in pixels))
+
+    corner_ids = [tile_ids[0], tile_ids[side - 1], tile_ids[-side], tile_ids[-1]]
+    rng.shuffle(tiles)
+
+    roughness = sum(row.count('#') for row in image) - len(SEA_MONSTER) * num_monsters
+
+    return Generated("\n\n".join(tiles), math.prod(corner_ids), roughness)
+
+
+def day20(size: int, rng: random.Random) -> Generated:
+    return tile_mosaic(int(size ** 0.5), rng)
+
+
+ALLERGENS = ["dairy", "eggs", "fish", "nuts", "peanuts", "sesame", "shellfish", "soy", "wheat"]
+
+
+def day21(size: int, rng: random.Random) -> Generated:
+    """
+    Each allergen gets two foods that list only it, and that have
+    nothing else in common besides its ingredient. So every allergen
+    is pinned down right away, and ingredients without allergens are
+    exactly the filler ones.
+    """
+    allergens = rng.sample(ALLERGENS, 8)
+    words = set()
+    while len(words) < 8 + max(200, size):
+        words.add(random_word(rng, 4, 8))
+    words = sorted(words)
+    rng.shuffle(words)
+    contains = dict(zip(allergens, words))
+    fillers = words[8:]
+    is_filler = set(fillers)
+
+    foods = []
+    for allergen in allergens:
+        chosen = rng.sample(fillers, 8)
+        foods.append((chosen[:4] + [contains[allergen]], [allergen]))
+        foods.append((chosen[4:] + [contains[allergen]], [allergen]))
+
+    while len(foods) < size:
+        listed = rng.sample(allergens, rng.randint(0, 3))
+        # sometimes an allergen's ingredient shows up without it being listed
+        unlisted = [contains[a] for a in allergens if a not in listed and rng.random() < 0.1]
+        ingredients = rng.sample(fillers, rng.randint(3, 12))
+        foods.append((ingredients + [contains[a] for a in listed] + unlisted, listed))
+    rng.shuffle(foods)
+
+    lines = []
+    no_allergens = 0
+    for ingredients, listed in foods:
+        rng.shuffle(ingredients)
+        no_allergens += sum(ingredient in is_filler for ingredient in ingredients)
+        line = ' '.join(ingredients)
+        if listed:
+            line += f" (contains {', '.join(listed)})"
+        lines.append(line)
+
+    canonical = ",".join(contains[allergen] for allergen in sorted(allergens))
+
+    return Generated("\n".join(lines), no_allergens, canonical)
+
+
+def day22(size: int, rng: random.Random) -> Generated:
+    """
+    Player 1's cards are all more than twice as big as anyone's deck can get,
+    so there's never a sub-game, player 1 wins every round of both versions,
+    and we know what their deck looks like at the end.
+    (That means part 2 mostly measures keeping track of the previous rounds.)
+    """
+    deck1 = rng.sample(range(2 * size + 1, 3 * size + 1), size)
+    deck2 = rng.sample(range(1, size + 1), size)
+
+    final = [card for pair in zip(deck1, deck2) for card in pair]
+    score = sum(card * i for card, i in zip(reversed(final), itertools.count(1)))
+
+    raw = ("Player 1:\n" + "\n".join(str(c) for c in deck1) +
+           "\n\nPlayer 2:\n" + "\n".join(str(c) for c in deck2))
+    return Generated(raw, score, score)
+
+
+# cups with known answers: the example, plus our input
+CUP_GAMES = [
+    ("389125467", "67384529", 149245887792),
+    ("157623984", "58427369", 111057672960),
+]
+
+
+def day23(size: int, rng: random.Random) -> Generated:
+    """
+    The work doesn't depend on the size of the input,
+    so this just picks one of the games we know the answers for.
+    """
+    return Generated(*rng.choice(CUP_GAMES))
+
+
+def day24(size: int, rng: random.Random) -> Generated:
+    """
+    Copies of the example, spread out on a grid. In 100 days the example
+    never gets more than 48 tiles away from the origin, so at 110 apart
+    the copies never affect each other.
+    """
+    example = """sesenwnenenewseeswwswswwnenewsewsw
+neeenesenwnwwswnenewnwwsewnenwseswesw
+seswneswswsenwwnwse
+nwnwneseeswswnenewneswwnewseswneseene
+swweswneswnenwsewnwneneseenw
+eesenwseswswnenwswnwnwsewwnwsene
+sewnenenenesenwsewnenwwwse
+wenwwweseeeweswwwnwwe
+wsweesenenewnwwnwsenewsenwwsesesenwne
+neeswseenwwswnwswswnw
+nenwswwsewswnenenewsenwsenwnesesenew
+enewnwewneswsewnwswenweswnenwsenwsw
+sweneswneswneneenwnewenewwneswswnese
+swwesenesewenwneswnwwneseswwne
+enesenwswwswneneswsenwnewswseenwsese
+wnwnesenesenenwwnenwsewesewsesesew
+nenewswnwewswnenesenwnesewesw
+eneswnwswnwsenenwnwnwwseeswneewsenese
+neswnwewnwnwseenwseesewsenwsweewe
+wseweeenwnesenwwwswnew""".split("\n")
+
+    copies = max(size // len(example), 1)
+    per_row = max(int(copies ** 0.5), 1)
+    spacing = 110
+
+    lines = []
+    for k in range(copies):
+        # center the grid on the origin to keep the paths short
+        east = (k % per_row - per_row // 2) * spacing
+        northeast = (k // per_row - copies // per_row // 2) * spacing
+        shift = ("e" if east > 0 else "w") * abs(east)
+        shift += ("ne" if northeast > 0 else "sw") * abs(northeast)
+        lines.extend(shift + line for line in example)
+    rng.shuffle(lines)
+
+    return Generated("\n".join(lines), 10 * copies, 2208 * copies)
+
+
+def day25(size: int, rng: random.Random) -> Generated:
+    """
+    Here the size is how big the loop sizes get. The multiplicative group
+    only has 20201226 elements, so they can't get any bigger than that.
+    """
+    modulus = 20201227
+    size = min(size, modulus - 2)
+    door_loop = rng.randint(max(size // 2, 1), max(size, 1))
+    card_loop = rng.randint(max(size // 2, 1), max(size, 1))
+    keys = f"{pow(7, door_loop, modulus)}\n{pow(7, card_loop, modulus)}"
+    key = pow(7, door_loop * card_loop, modulus)
+    return Generated(keys, key, key)
+
+
+GENERATORS: Dict[str, Generator] = {
+    "day01": day01,
+    "day02": day02,
+    "day03": day03,
+    "day04": day04,
+    "day05": day05,
+    "day06": day06,
+    "day07": day07,
+    "day08": day08,
+    "day09": day09,
+    "day10": day10,
+    "day11": day11,
+    "day12": day12,
+    "day13": day13,
+    "day14": day14,
+    "day15": day15,
+    "day16": day16,
+    "day17": day17,
+    "day18": day18,
+    "day19": day19,
+    "day20": day20,
+    "day21": day21,
+    "day22": day22,
+    "day23": day23,
+    "day24": day24,
+    "day25": day25,
+}
+
+# roughly the size of the real inputs, in each generator's units
+BASE_SIZES: Dict[str, int] = {
+    "day01": 200,
+    "day02": 1000,
+    "day03": 323,
+    "day04": 290,
+    "day05": 842,
+    "day06": 490,
+    "day07": 594,
+    "day08": 641,
+    "day09": 1000,
+    "day10": 106,
+    "day11": 92,
+    "day12": 770,
+    "day13": 9,
+    "day14": 563,
+    "day15": 1,
+    "day16": 240,
+    "day17": 6,
+    "day18": 373,
+    "day19": 400,
+    "day20": 144,
+    "day21": 44,
+    "day22": 25,
+    "day23": 1,
+    "day24": 563,
+    "day25": 5_000_000,
+}
+
+
+def generator_for(day: str) -> Optional[Generator]:
+    """
+    The variants (e.g. day14_v2) use the generator for their day
+    """
+    return GENERATORS.get(day.split("_")[0])
+
+
+def generate(day: str, size: int, seed: int = 0) -> Generated:
+    generator = generator_for(day)
+    if generator is None:
+        raise ValueError(f"no generator for {day}")
+    return generator(size, random.Random(seed))
+
+
+def generate_scaled(day: str, scale: int, seed: int = 0) -> Generated:
+    """
+    Generate an input about `scale` times the size of the real one
+    """
+    return generate(day, scale * BASE_SIZES[day.split("_")[0]], seed)
+
+
+def check(day: str, generated: Generated) -> Dict[str, bool]:
+    """
+    Run the solution on a generated input and compare with the known answers
+    """
+    answers = solve(load_day(day), generated.raw)
+    return {f"part{part}": answer == expected
+            for part, answer, expected in zip((1, 2), answers, generated[1:])
+            if expected is not None}
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="advent2020-generate",
+        description="Write a generated input to stdout (and its answers to stderr)")
+    parser.add_argument("day", help="which day, e.g. 7 or day07")
+    size = parser.add_mutually_exclusive_group()
+    size.add_argument("--size", type=int, help="size in the generator's own units")
+    size.add_argument("--scale", type=int, default=1,
+                      help="size as a multiple of the real input (default: 1)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--check", action="store_true",
+                        help="run the solution on it and check the answers")
+    args = parser.parse_args(argv)
+
+    [day] = module_names(parser, [args.day])
+    if generator_for(day) is None:
+        parser.error(f"no generator for {day}")
+
+    if args.size is not None:
+        generated = generate(day, args.size, args.seed)
+    else:
+        generated = generate_scaled(day, args.scale, args.seed)
+
+    if args.check:
+        results = check(day, generated)
+        for part, ok in results.items():
+            print(f"{day} {part}: {'ok' if ok else 'WRONG'}")
+        if not all(results.values()):
+            sys.exit(1)
+    else:
+        print(generated.raw)
+        print(f"part1: {generated.part1}", file=sys.stderr)
+        print(f"part2: {generated.part2}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""
+Find out where the memory goes. For each day and phase (parse, part1,
+part2) it records the peak traced memory, the peak RSS, and the lines
+of code that had the most memory allocated at (close to) the peak:
+
+    python -m advent2020.memory 22 23 14
+    python -m advent2020.memory 23 --top 5 --output memory.json
+
+tracemalloc can only take snapshots of what's allocated *now*, and the
+big allocations in e.g. day23 part 2 are gone by the time the part
+returns, so a background thread takes a snapshot every `interval`
+seconds and we keep the biggest one.
+
+Each day runs in its own process, so the days don't share a heap or
+an RSS. On Linux the peak RSS gets reset between phases (through
+/proc/self/clear_refs); elsewhere it's the peak for the process so far.
+Either way it includes tracemalloc's own bookkeeping, which for
+millions of small objects is not small.
+
+Everything runs a lot slower under tracemalloc, hence the budget.
+"""
+from __future__ import annotations
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import argparse
+import json
+import multiprocessing
+import os
+import re
+import resource
+import sys
+import threading
+import tracemalloc
+
+from advent2020.bench import PHASES, format_bytes, reset_peak
+from advent2020.runner import available_days, input_path, load_day, module_names
+
+TOP = 10
+INTERVAL = 0.1
+
+
+def reset_peak_rss() -> None:
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def peak_rss() -> int:
+    """
+    The peak resident set size in bytes
+    """
+    try:
+        with open("/proc/self/status") as f:
+            match = re.search(r"VmHWM:\s+(\d+) kB", f.read())
+        if match:
+            return int(match.group(1)) * 1024
+    except OSError:
+        pass
+    # kilobytes on Linux, bytes on macOS
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+class Sampler(threading.Thread):
+    """
+    Takes a tracemalloc snapshot whenever the traced memory
+    is bigger than it was at the last one
+    """
+    def __init__(self, interval: float = INTERVAL) -> None:
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.size = 0
+        self.snapshot: Optional[tracemalloc.Snapshot] = None
+
+    def sample(self) -> None:
+        size, _ = tracemalloc.get_traced_memory()
+        if size > self.size:
+            self.size = size
+            self.snapshot = tracemalloc.take_snapshot()
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.interval):
+            self.sample()
+
+    def stop(self) -> None:
+        self.stopped.set()
+        self.join()
+        # catches phases too quick for the thread,
+        # and whatever the phase returned
+        self.sample()
+
+
+# our own allocations, and the sampler thread's
+IGNORE = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, threading.__file__),
+    tracemalloc.Filter(False, "*/_weakrefset.py"),
+    tracemalloc.Filter(False, __file__),
+]
+
+
+def top_sites(snapshot: Optional[tracemalloc.Snapshot], before: tracemalloc.Snapshot,
+              limit: int = TOP) -> List[Dict[str, Any]]:
+    """
+    The lines that allocated the most memory (still alive in the snapshot)
+    since the `before` snapshot, so that e.g. the parsed input
+    doesn't show up again in every part
+    """
+    if snapshot is None:
+        return []
+    stats = snapshot.filter_traces(IGNORE).compare_to(before.filter_traces(IGNORE), "lineno")
+    return [
+        {
+            "site": f"{os.path.relpath(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+            "bytes": stat.size_diff,
+            "count": stat.count_diff,
+        }
+        for stat in stats[:limit]
+        if stat.size_diff > 0
+    ]
+
+
+def measure_phase(fn: Callable[..., Any], *args: Any, top: int = TOP,
+                  interval: float = INTERVAL) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Call fn(*args) (with tracemalloc already started),
+    returning its result and the memory report for it
+    """
+    before = tracemalloc.take_snapshot()
+    reset_peak_rss()
+    reset_peak()
+    sampler = Sampler(interval)
+    sampler.start()
+    try:
+        result = fn(*args)
+    finally:
+        sampler.stop()
+
+    return result, {
+        "peak_bytes": tracemalloc.get_traced_memory()[1],
+        "peak_rss": peak_rss(),
+        "top": top_sites(sampler.snapshot, before, top),
+    }
+
+
+def measure_day(conn: Any, day: str, top: int, interval: float) -> None:
+    """
+    Runs in the child process, sending back a report for each phase as it finishes
+    """
+    try:
+        module = load_day(day)
+        with open(input_path(day)) as f:
+            raw = f.read()
+
+        tracemalloc.start()
+        parsed, report = measure_phase(module.parse, raw, top=top, interval=interval)
+        conn.send(("parse", report))
+
+        for part in PHASES[1:]:
+            _, report = measure_phase(getattr(module, part), parsed, top=top, interval=interval)
+            conn.send((part, report))
+    except Exception as e:
+        conn.send(("error", f"{type(e).__name__}: {e}"))
+    finally:
+        tracemalloc.stop()
+        conn.close()
+
+
+def memory_report(day: str, top: int = TOP, interval: float = INTERVAL,
+                  budget: float = 600) -> Dict[str, Any]:
+    parent, child = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=measure_day, args=(child, day, top, interval))
+    process.start()
+    child.close()
+
+    result: Dict[str, Any] = {"day": day, "status": "ok", "phases": {}}
+    try:
+        while len(result["phases"]) < len(PHASES):
+            if not parent.poll(budget):
+                result["status"] = "timeout"
+                break
+            phase, payload = parent.recv()
+            if phase == "error":
+                result["status"] = "error"
+                result["error"] = payload
+                break
+            result["phases"][phase] = payload
+    except EOFError:
+        result["status"] = "error"
+        result["error"] = "child process died"
+
+    process.terminate()
+    process.join()
+    return result
+
+
+def format_report(result: Dict[str, Any]) -> str:
+    lines = []
+    for phase, report in result["phases"].items():
+        lines.append(f"{result['day']} {phase}: peak traced {format_bytes(report['peak_bytes'])}, "
+                     f"peak RSS {format_bytes(report['peak_rss'])}")
+        for site in report["top"]:
+            lines.append(f"    {format_bytes(site['bytes']):>8} {site['count']:>9} blocks  {site['site']}")
+    if result["status"] != "ok":
+        lines.append(f"{result['day']}: {result['status']} {result.get('error', '')}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="advent2020-memory", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("days", nargs="*", help="which days to run (default: all)")
+    parser.add_argument("--top", type=int, default=TOP, help="how many allocation sites to show")
+    parser.add_argument("--interval", type=float, default=INTERVAL,
+                        help="seconds between snapshots")
+    parser.add_argument("--budget", type=float, default=600,
+                        help="seconds allowed for each phase")
+    parser.add_argument("--output", help="also write the reports to this JSON file")
+    args = parser.parse_args(argv)
+
+    days = module_names(parser, args.days) or available_days()
+
+    results = []
+    for day in days:
+        result = memory_report(day, args.top, args.interval, args.budget)
+        print(format_report(result), flush=True)
+        results.append(result)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
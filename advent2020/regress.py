@@ -0,0 +1,244 @@
+"""
+Check for performance regressions against a stored baseline:
+
+    python -m advent2020.regress                  # compare with benchmarks/baseline.json
+    python -m advent2020.regress 9 23_v2          # just these days
+    python -m advent2020.regress --update         # re-measure and save a new baseline
+
+It re-runs the (day, scale)s in the baseline and fails if a phase got
+slower by more than the time threshold (default +20%) or its peak memory
+grew by more than the memory threshold (default +30%), or if a day that
+used to finish now times out, errors, or gets the wrong answer.
+
+To keep noise on a shared machine from failing the check:
+
+* times are compared by their medians over repeated runs,
+* a slowdown also has to be bigger than a few times the median absolute
+  deviation of the runs, and bigger than MIN_SECONDS,
+* anything that looks like a regression gets measured a second time,
+  and only counts if it shows up again.
+
+Thresholds can also be set in the baseline file, under "thresholds".
+"""
+from __future__ import annotations
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+import argparse
+import json
+import os
+import sys
+
+from advent2020 import bench
+from advent2020.runner import BASELINE, available_days, module_names
+
+TIME_THRESHOLD = 0.20
+MEMORY_THRESHOLD = 0.30
+
+# differences smaller than these are never regressions
+MIN_SECONDS = 0.002
+MIN_BYTES = 64 * 1024
+
+# how many MADs a slowdown has to be to stand out from the noise
+NOISE_MADS = 3
+
+Key = Tuple[str, int]
+
+
+class Finding(NamedTuple):
+    day: str
+    scale: int
+    phase: str
+    what: str
+    baseline: Any
+    current: Any
+    regressed: bool
+
+    def change(self) -> str:
+        if isinstance(self.baseline, (int, float)) and isinstance(self.current, (int, float)) and self.baseline:
+            return f"{(self.current - self.baseline) / self.baseline:+.0%}"
+        return ""
+
+
+def load_baseline(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+
+def by_key(results: Sequence[Dict[str, Any]]) -> Dict[Key, Dict[str, Any]]:
+    return {(result["day"], result["scale"]): result for result in results}
+
+
+def compare_time(base: Dict[str, Any], current: Dict[str, Any], threshold: float) -> bool:
+    slowdown = current["median"] - base["median"]
+    noise = NOISE_MADS * max(base.get("mad", 0), current.get("mad", 0))
+    return (current["median"] > base["median"] * (1 + threshold)
+            and slowdown > noise
+            and slowdown > MIN_SECONDS)
+
+
+def compare_memory(base: Optional[int], current: Optional[int], threshold: float) -> bool:
+    if base is None or current is None:
+        return False
+    return current > base * (1 + threshold) and current - base > MIN_BYTES
+
+
+def compare(base: Dict[str, Any], current: Dict[str, Any],
+            time_threshold: float, memory_threshold: float) -> List[Finding]:
+    """
+    Everything worth reporting about one (day, scale)
+    """
+    day, scale = base["day"], base["scale"]
+
+    if base["status"] != "ok":
+        # nothing to hold it to
+        return []
+    if current["status"] != "ok":
+        return [Finding(day, scale, "-", "status", "ok", current["status"], True)]
+
+    findings = []
+    for part, ok in current["correct"].items():
+        if ok is False:
+            findings.append(Finding(day, scale, part, "answer", "right", "WRONG", True))
+
+    for phase in bench.PHASES:
+        base_stats = base["phases"][phase]
+        current_stats = current["phases"][phase]
+        findings.append(Finding(day, scale, phase, "time",
+                                base_stats["median"], current_stats["median"],
+                                compare_time(base_stats, current_stats, time_threshold)))
+
+        base_peak = base_stats.get("peak_bytes")
+        current_peak = current_stats.get("peak_bytes")
+        if base_peak is not None and current_peak is not None:
+            findings.append(Finding(day, scale, phase, "memory", base_peak, current_peak,
+                                    compare_memory(base_peak, current_peak, memory_threshold)))
+
+    return findings
+
+
+def best_of(first: Dict[str, Any], second: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Combine two measurements of the same (day, scale), keeping the
+    better of the two for each phase, since noise only ever slows things down
+    """
+    if first["status"] != "ok":
+        return second
+    if second["status"] != "ok":
+        return first
+
+    combined = {**second, "phases": {}}
+    for phase in bench.PHASES:
+        a, b = first["phases"][phase], second["phases"][phase]
+        best = dict(a if a["median"] <= b["median"] else b)
+        peaks = [p for p in (a.get("peak_bytes"), b.get("peak_bytes")) if p is not None]
+        if peaks:
+            best["peak_bytes"] = min(peaks)
+        combined["phases"][phase] = best
+    return combined
+
+
+def format_value(what: str, value: Any) -> str:
+    if what == "time" and isinstance(value, float):
+        return f"{value * 1000:.2f}ms"
+    if what == "memory" and isinstance(value, int):
+        return bench.format_bytes(value)
+    return str(value)
+
+
+def format_findings(findings: Sequence[Finding], verbose: bool = False) -> str:
+    lines = [f"{'day':<9} {'scale':>6} {'phase':<6} {'what':<7} {'baseline':>12} {'now':>12} {'change':>8}"]
+    for f in findings:
+        if f.regressed or verbose:
+            flag = "  REGRESSED" if f.regressed else ""
+            lines.append(f"{f.day:<9} {f.scale:>5}x {f.phase:<6} {f.what:<7} "
+                         f"{format_value(f.what, f.baseline):>12} {format_value(f.what, f.current):>12} "
+                         f"{f.change():>8}{flag}")
+    return "\n".join(lines)
+
+
+def check(baseline: Dict[str, Any], days: Sequence[str] = (), repeat: int = 5,
+          budget: float = 300, time_threshold: Optional[float] = None,
+          memory_threshold: Optional[float] = None) -> List[Finding]:
+    thresholds = baseline.get("thresholds", {})
+    time_threshold = time_threshold if time_threshold is not None else thresholds.get("time", TIME_THRESHOLD)
+    memory_threshold = memory_threshold if memory_threshold is not None else thresholds.get("memory", MEMORY_THRESHOLD)
+    seed = baseline.get("meta", {}).get("seed", 0)
+
+    findings = []
+    for key, base in by_key(baseline["results"]).items():
+        day, scale = key
+        if days and day not in days:
+            continue
+        memory = any("peak_bytes" in stats for stats in base.get("phases", {}).values())
+
+        current = bench.measure_in_child(day, scale, seed, repeat, budget, memory)
+        found = compare(base, current, time_threshold, memory_threshold)
+
+        if any(f.regressed for f in found):
+            # could be noise, so give it a second chance
+            again = bench.measure_in_child(day, scale, seed, repeat, budget, memory)
+            found = compare(base, best_of(current, again), time_threshold, memory_threshold)
+
+        findings.extend(found)
+        print(f"{day} {scale}x: {'REGRESSED' if any(f.regressed for f in found) else 'ok'}",
+              file=sys.stderr, flush=True)
+
+    return findings
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="advent2020-regress", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("days", nargs="*", help="which days to check (default: all in the baseline)")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--time-threshold", type=float,
+                        help=f"allowed slowdown as a fraction (default: {TIME_THRESHOLD})")
+    parser.add_argument("--memory-threshold", type=float,
+                        help=f"allowed peak memory growth as a fraction (default: {MEMORY_THRESHOLD})")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=300,
+                        help="seconds allowed for each (day, scale)")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1],
+                        help="scales to measure with --update (default: 1)")
+    parser.add_argument("--seed", type=int, default=0, help="seed to use with --update")
+    parser.add_argument("--update", action="store_true",
+                        help="measure and write a new baseline instead of checking")
+    parser.add_argument("--verbose", action="store_true",
+                        help="show every comparison, not just the regressions")
+    args = parser.parse_args(argv)
+
+    days = module_names(parser, args.days)
+
+    if args.update:
+        print(bench.HEADER)
+        results = bench.benchmark(days or available_days(), args.scales, args.seed,
+                                  args.repeat, args.budget, verbose=True)
+
+        # updating just some days keeps the others' results
+        if days and os.path.exists(args.baseline):
+            kept = [r for r in load_baseline(args.baseline)["results"] if r["day"] not in days]
+            results = sorted(kept + results, key=lambda r: (r["day"], r["scale"]))
+
+        baseline = {
+            "meta": bench.metadata(args),
+            "thresholds": {"time": args.time_threshold or TIME_THRESHOLD,
+                           "memory": args.memory_threshold or MEMORY_THRESHOLD},
+            "results": results,
+        }
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2)
+        return
+
+    findings = check(load_baseline(args.baseline), days, args.repeat, args.budget,
+                     args.time_threshold, args.memory_threshold)
+    regressions = [f for f in findings if f.regressed]
+
+    if regressions or args.verbose:
+        print(format_findings(findings, args.verbose))
+    print(f"{len(regressions)} regressions in {len(findings)} comparisons")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+"""
+Run the solutions for a single day, e.g.
+
+    advent2020 7
+    advent2020 23_v2 --part 1
+    advent2020 14 --input my_input.txt
+
+Every day module exposes `parse(raw)`, `part1(parsed)` and `part2(parsed)`,
+and only the requested day gets imported, so you don't pay for the others.
+
+Give it more than one day (or `all`) and each (day, part) gets solved
+in its own worker process, followed by a report of how long each took:
+
+    advent2020 all
+    advent2020 7 9 11 --workers 2
+
+With --stream, the days that can (e.g. 1, 4, 6, 16, 21) go through the input
+in a single pass without reading it all in, for inputs too big for memory.
+With --cache, answers get saved to (and reused from) advent2020.cache,
+and with --parse-cache, parsed inputs do (see advent2020.cache.ParseCache).
+With --profile PATH it also writes timings and cProfile stats
+(see advent2020.utils), one pair of files per (day, part) when
+running several days.
+"""
+from __future__ import annotations
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+from types import ModuleType
+import argparse
+import concurrent.futures
+import cProfile
+import importlib
+import json
+import math
+import os
+import pkgutil
+import time
+
+import advent2020
+from advent2020.cache import CACHE_DIR, ParseCache, ResultCache
+from advent2020.utils import enable_profiling, mapped_lines, phase, reset_stats, write_profile
+
+PARTS = (1, 2)
+# the benchmark results (see advent2020.regress), which also say which days are slow
+BASELINE = "benchmarks/baseline.json"
+
+
+def module_name(day: str) -> str:
+    """
+    '7' -> 'day07', '23_v2' -> 'day23_v2', 'day09' -> 'day09'
+    """
+    number, _, suffix = (day[3:] if day.startswith("day") else day).partition("_")
+    if not number.isascii() or not number.isdigit():
+        raise ValueError(f"no such day: {day}")
+    name = f"day{int(number):02d}"
+    return f"{name}_{suffix}" if suffix else name
+
+
+def module_names(parser: argparse.ArgumentParser, days: Sequence[str]) -> List[str]:
+    """
+    module_name for each day from the command line,
+    with a usage error (rather than a traceback) for one that isn't a day
+    """
+    try:
+        return [module_name(day) for day in days]
+    except ValueError as e:
+        parser.error(str(e))
+
+
+def input_path(day: str) -> str:
+    """
+    The variants (e.g. day14_v2) share the input for their day
+    """
+    return f"inputs/{module_name(day).split('_')[0]}.txt"
+
+
+def available_days() -> List[str]:
+    """
+    The names of all the day modules, found without importing any of them
+    """
+    return sorted(
+        info.name
+        for info in pkgutil.iter_modules(advent2020.__path__)
+        if info.name.startswith("day")
+    )
+
+
+def load_day(day: str) -> ModuleType:
+    return importlib.import_module(f"advent2020.{module_name(day)}")
+
+
+def parse_input(module: ModuleType, raw: str, path: Optional[str] = None,
+                parse_cache: Optional[ParseCache] = None) -> Any:
+    """
+    module.parse(raw), unless the parse cache has the input from `path` already parsed
+    """
+    with phase("parse"):
+        if parse_cache and path:
+            day = module.__name__.split(".")[-1]
+            parsed = parse_cache.get(day, path)
+            if parsed is None:
+                parsed = module.parse(raw)
+                # before the parts get a chance to modify it
+                parse_cache.put(day, path, parsed)
+            return parsed
+        return module.parse(raw)
+
+
+def solve(module: ModuleType, raw: str, parts: Sequence[int] = PARTS,
+          path: Optional[str] = None, parse_cache: Optional[ParseCache] = None) -> List[Any]:
+    parsed = parse_input(module, raw, path, parse_cache)
+
+    answers = []
+    for part in parts:
+        with phase(f"part{part}"):
+            answers.append(getattr(module, f"part{part}")(parsed))
+    return answers
+
+
+def cached_solve(day: str, raw: str, parts: Sequence[int], cache: ResultCache,
+                 path: Optional[str] = None, parse_cache: Optional[ParseCache] = None) -> List[Any]:
+    """
+    Only import, parse and solve if some part isn't in the cache
+    """
+    answers = {part: cache.get(day, part, raw) for part in parts}
+    missing = [part for part, answer in answers.items() if answer is None]
+
+    if missing:
+        for part, answer in zip(missing, solve(load_day(day), raw, missing, path, parse_cache)):
+            cache.put(day, part, raw, answer)
+            answers[part] = answer
+
+    return [answers[part] for part in parts]
+
+
+class Timing(NamedTuple):
+    day: str
+    part: int
+    answer: Any
+    parse: float
+    solve: float
+    error: Optional[str] = None
+    cached: bool = False
+
+
+def timed_solve(day: str, part: int, profile: Optional[str] = None,
+                cache: Optional[ResultCache] = None,
+                parse_cache: Optional[ParseCache] = None) -> Timing:
+    """
+    Solve one part of one day from scratch (import, read, parse, solve),
+    which is what each worker process does.
+    """
+    profiler = cProfile.Profile() if profile else None
+    try:
+        with open(input_path(day)) as f:
+            raw = f.read()
+
+        if cache:
+            start = time.perf_counter()
+            answer = cache.get(day, part, raw)
+            if answer is not None:
+                return Timing(day, part, answer, 0.0, time.perf_counter() - start, cached=True)
+
+        module = load_day(day)
+
+        if profiler:
+            reset_stats()
+            profiler.enable()
+
+        start = time.perf_counter()
+        parsed = parse_input(module, raw, input_path(day), parse_cache)
+        parsed_at = time.perf_counter()
+        with phase(f"part{part}"):
+            answer = getattr(module, f"part{part}")(parsed)
+        solved_at = time.perf_counter()
+
+        if cache:
+            cache.put(day, part, raw, answer)
+
+        return Timing(day, part, answer, parsed_at - start, solved_at - parsed_at)
+    except Exception as e:
+        return Timing(day, part, None, 0.0, 0.0, f"{type(e).__name__}: {e}")
+    finally:
+        if profiler:
+            profiler.disable()
+            write_profile(f"{profile}.{day}.part{part}", profiler)
+
+
+def expected_seconds(baseline: str = BASELINE) -> Dict[Tuple[str, int], float]:
+    """
+    How long each (day, part) took, parse included, on its real input
+    in the benchmark baseline (or nothing, if there isn't one)
+    """
+    try:
+        with open(baseline) as f:
+            results = json.load(f)["results"]
+    except (OSError, ValueError, KeyError):
+        return {}
+    return {
+        (result["day"], part): result["phases"]["parse"]["median"] + result["phases"][f"part{part}"]["median"]
+        for result in results
+        if result.get("scale") == 1 and result.get("status") == "ok"
+        for part in PARTS
+    }
+
+
+def solve_all(days: Sequence[str], parts: Sequence[int] = PARTS,
+              workers: Optional[int] = None, profile: Optional[str] = None,
+              cache: Optional[ResultCache] = None,
+              parse_cache: Optional[ParseCache] = None) -> List[Timing]:
+    """
+    Every (day, part) is independent, so they all go to the pool at once,
+    and the wall time is bounded by the slowest of them rather than the sum.
+    That only works if the slowest ones start first, so they go in
+    slowest first (by the baseline, with the ones it doesn't have first of all),
+    and the timings come back in the original order.
+    """
+    tasks = [(day, part) for day in days for part in parts]
+    seconds = expected_seconds()
+    slowest_first = sorted(tasks, key=lambda task: seconds.get(task, math.inf), reverse=True)
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {task: pool.submit(timed_solve, *task, profile, cache, parse_cache) for task in slowest_first}
+        return [futures[task].result() for task in tasks]
+
+
+def report(timings: Sequence[Timing], wall: float, workers: int) -> str:
+    lines = [f"{'day':<9} {'part':>4} {'parse ms':>10} {'solve ms':>12}  answer"]
+    for t in timings:
+        answer = f"ERROR {t.error}" if t.error else f"{t.answer} (cached)" if t.cached else t.answer
+        lines.append(f"{t.day:<9} {t.part:>4} {t.parse * 1000:>10.1f} {t.solve * 1000:>12.1f}  {answer}")
+
+    total = sum(t.parse + t.solve for t in timings)
+    slowest = max(timings, key=lambda t: t.parse + t.solve)
+    lines.append("")
+    lines.append(f"{len(timings)} tasks on {workers} workers: {wall:.2f}s wall, {total:.2f}s total, "
+                 f"slowest {slowest.day} part {slowest.part} ({slowest.parse + slowest.solve:.2f}s)")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="advent2020", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("days", nargs="+", metavar="day",
+                        help="which day(s) to run, e.g. 7 or 23_v2, or all")
+    parser.add_argument("--part", type=int, choices=PARTS, action="append",
+                        help="only run this part (can be repeated)")
+    parser.add_argument("--input", help="input file (default: inputs/dayNN.txt)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="worker processes when running several days (default: one per core)")
+    parser.add_argument("--profile", metavar="PATH",
+                        help="write timings to PATH.json and cProfile stats to PATH.prof")
+    parser.add_argument("--stream", action="store_true",
+                        help="go through the input lazily, in constant memory "
+                             "(only for days with a stream_answers, e.g. 1, 4, 6, 16, 21)")
+    parser.add_argument("--cache", action="store_true",
+                        help="reuse answers from (and save them to) the cache in " + CACHE_DIR)
+    parser.add_argument("--parse-cache", action="store_true",
+                        help="reuse parsed inputs from (and save them to) files next to the inputs")
+    args = parser.parse_args(argv)
+
+    if args.profile:
+        # has to happen before any day gets imported
+        enable_profiling()
+
+    days = available_days() if args.days == ["all"] else module_names(parser, args.days)
+    for day in days:
+        if day not in available_days():
+            parser.error(f"no such day: {day}")
+
+    cache = ResultCache() if args.cache else None
+    parse_cache = ParseCache() if args.parse_cache else None
+
+    if len(days) > 1:
+        if args.input or args.stream:
+            parser.error("--input and --stream only work with a single day")
+        start = time.perf_counter()
+        timings = solve_all(days, args.part or PARTS, args.workers, args.profile, cache,
+                            parse_cache)
+        print(report(timings, time.perf_counter() - start, args.workers))
+        return
+
+    path = args.input or input_path(days[0])
+
+    if args.stream:
+        module = load_day(days[0])
+        if not hasattr(module, "stream_answers"):
+            parser.error(f"{days[0]} can't stream its input")
+        answers = module.stream_answers(mapped_lines(path))
+        for part in args.part or PARTS:
+            print(answers[part - 1])
+        return
+
+    with open(path) as f:
+        raw = f.read()
+
+    if cache and not args.profile:
+        answers = cached_solve(days[0], raw, args.part or PARTS, cache, path, parse_cache)
+    else:
+        module = load_day(days[0])
+
+        profiler = cProfile.Profile() if args.profile else None
+        if profiler:
+            # don't count the unit tests that ran on import
+            reset_stats()
+            profiler.enable()
+
+        answers = solve(module, raw, args.part or PARTS, path, parse_cache)
+
+        if profiler:
+            profiler.disable()
+            write_profile(args.profile, profiler)
+
+    for answer in answers:
+        print(answer)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+"""
+A local solve server that keeps the day modules imported (and their
+unit tests already run) in a pool of worker processes, so that tools
+can ask for answers without paying for the start-up every time:
+
+    python -m advent2020.server serve --socket /tmp/advent2020.sock --workers 4
+    python -m advent2020.server ask 7 1 --socket /tmp/advent2020.sock
+    python -m advent2020.server ask 14 2 --input big.txt
+    python -m advent2020.server metrics
+
+The protocol is lines of JSON over a Unix socket (or localhost TCP with
+--port). A request is
+
+    {"id": 1, "day": "7", "part": 1, "input": "..."}
+
+(without "input" it uses the day's puzzle input), and the response is
+
+    {"id": 1, "day": "day07", "part": 1, "answer": 248, "seconds": 0.004}
+
+or the same with "error" instead of "answer". Requests on a connection
+run concurrently and their responses come back as they finish, so match
+them up by id. {"op": "metrics"} gets back request counts and latency
+percentiles for each (day, part).
+
+Backpressure: at most --max-pending requests are in flight at once;
+after that the server stops reading from its connections until some
+finish, and the clients' writes back up.
+
+Timeouts: each request gets --timeout seconds, enforced inside the
+worker with an alarm signal (so the worker is free again afterwards)
+and in the server in case the worker doesn't respond.
+"""
+from __future__ import annotations
+from typing import Any, Deque, Dict, Optional, Sequence, Set, Tuple
+import argparse
+import asyncio
+import collections
+import concurrent.futures
+import json
+import os
+import signal
+import socket
+import time
+
+from advent2020.bench import percentile
+from advent2020.runner import available_days, input_path, load_day, module_name, solve
+
+SOCKET = "/tmp/advent2020.sock"
+TIMEOUT = 60.0
+MAX_PENDING = 64
+# how many latencies to keep for each (day, part)
+WINDOW = 1000
+# the longest request line (and so input) we'll take
+LINE_LIMIT = 64 * 1024 * 1024
+
+
+class RequestTimeout(Exception):
+    pass
+
+
+def _on_alarm(signum: int, frame: Any) -> None:
+    raise RequestTimeout()
+
+
+def warm_up(days: Sequence[str]) -> None:
+    """
+    Runs in each worker as it starts
+    """
+    for day in days:
+        load_day(day)
+    signal.signal(signal.SIGALRM, _on_alarm)
+
+
+def solve_request(day: str, part: int, raw: Optional[str], timeout: float) -> Tuple[Any, float]:
+    """
+    Runs in a worker, returning the answer and how long it took
+    """
+    if raw is None:
+        with open(input_path(day)) as f:
+            raw = f.read()
+
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        start = time.perf_counter()
+        [answer] = solve(load_day(day), raw, [part])
+        return answer, time.perf_counter() - start
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+class Metrics:
+    def __init__(self) -> None:
+        self.started = time.time()
+        self.counts: Dict[str, int] = collections.Counter()
+        self.latencies: Dict[str, Deque[float]] = collections.defaultdict(
+            lambda: collections.deque(maxlen=WINDOW))
+
+    def record(self, key: str, outcome: str, latency: float) -> None:
+        self.counts[outcome] += 1
+        self.latencies[key].append(latency)
+
+    def summary(self, pending: int) -> Dict[str, Any]:
+        return {
+            "uptime": time.time() - self.started,
+            "pending": pending,
+            "counts": dict(self.counts),
+            "latency": {
+                key: {
+                    "count": len(values),
+                    "p50": percentile(values, 50),
+                    "p95": percentile(values, 95),
+                    "max": max(values),
+                }
+                for key, values in sorted(self.latencies.items())
+            },
+        }
+
+
+class SolveServer:
+    def __init__(self, workers: Optional[int] = None, timeout: float = TIMEOUT,
+                 max_pending: int = MAX_PENDING, days: Sequence[str] = ()) -> None:
+        self.timeout = timeout
+        self.max_pending = max_pending
+        self.slots = asyncio.Semaphore(max_pending)
+        self.in_flight = 0
+        self.metrics = Metrics()
+        self.days = set(available_days())
+        # what's been sent to the pool and isn't done, to cancel on close
+        self.submitted: Set[concurrent.futures.Future] = set()
+        self.pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers, initializer=warm_up, initargs=(list(days) or sorted(self.days),))
+
+    async def handle_request(self, line: bytes) -> Dict[str, Any]:
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("expected an object")
+        except ValueError as e:
+            self.metrics.record("bad request", "error", 0.0)
+            return {"error": f"bad request: {e}"}
+
+        if request.get("op") == "metrics":
+            return {"id": request.get("id"), "metrics": self.metrics.summary(self.in_flight)}
+
+        response: Dict[str, Any] = {"id": request.get("id")}
+        start = time.perf_counter()
+        outcome = "ok"
+        key = "bad request"
+        try:
+            day = module_name(str(request["day"]))
+            part = int(request["part"])
+            if day not in self.days or part not in (1, 2):
+                raise ValueError(f"no such day/part: {request['day']}/{request['part']}")
+            key = f"{day}/part{part}"
+            response.update(day=day, part=part)
+
+            future = self.pool.submit(solve_request, day, part, request.get("input"), self.timeout)
+            self.submitted.add(future)
+            future.add_done_callback(self.submitted.discard)
+            work = asyncio.wrap_future(future)
+            # a little longer than the worker's own alarm, which should go off first
+            answer, seconds = await asyncio.wait_for(work, self.timeout + 5)
+            response.update(answer=answer, seconds=seconds)
+        except (RequestTimeout, asyncio.TimeoutError):
+            outcome = "timeout"
+            response["error"] = f"timed out after {self.timeout}s"
+        except Exception as e:
+            outcome = "error"
+            response["error"] = f"{type(e).__name__}: {e}"
+
+        self.metrics.record(key, outcome, time.perf_counter() - start)
+        return response
+
+    async def respond(self, line: bytes, writer: asyncio.StreamWriter, lock: asyncio.Lock) -> None:
+        self.in_flight += 1
+        try:
+            response = await self.handle_request(line)
+            async with lock:
+                writer.write((json.dumps(response, default=str) + "\n").encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.in_flight -= 1
+            self.slots.release()
+
+    async def handle_connection(self, reader: asyncio.StreamReader,
+                                writer: asyncio.StreamWriter) -> None:
+        lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while True:
+                # wait for a free slot *before* reading the next request,
+                # which is what pushes back on the clients
+                await self.slots.acquire()
+                line = await reader.readline()
+                if not line:
+                    self.slots.release()
+                    break
+                task = asyncio.create_task(self.respond(line, writer, lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+
+            await asyncio.gather(*tasks)
+        except (ConnectionError, ValueError):
+            # ValueError is a line over the limit; we can't tell
+            # where the next request starts, so give up on this connection
+            self.slots.release()
+        finally:
+            writer.close()
+
+    def close(self) -> None:
+        # shutdown(cancel_futures=True) would do this, but only from Python 3.9
+        for future in list(self.submitted):
+            future.cancel()
+        self.pool.shutdown()
+
+
+async def serve(socket_path: Optional[str], port: Optional[int], **kwargs: Any) -> None:
+    server = SolveServer(**kwargs)
+    try:
+        if port is not None:
+            listener = await asyncio.start_server(server.handle_connection, "127.0.0.1", port,
+                                                  limit=LINE_LIMIT)
+        else:
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+            listener = await asyncio.start_unix_server(server.handle_connection, socket_path,
+                                                       limit=LINE_LIMIT)
+        async with listener:
+            print(f"listening on {port if port is not None else socket_path}", flush=True)
+            await listener.serve_forever()
+    finally:
+        server.close()
+
+
+def connect(socket_path: str = SOCKET, port: Optional[int] = None) -> socket.socket:
+    if port is not None:
+        return socket.create_connection(("127.0.0.1", port))
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.connect(socket_path)
+    return sock
+
+
+def ask(request: Dict[str, Any], socket_path: str = SOCKET, port: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Send one request and wait for its response
+    """
+    with connect(socket_path, port) as sock, sock.makefile("rw") as f:
+        f.write(json.dumps(request) + "\n")
+        f.flush()
+        return json.loads(f.readline())
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="advent2020-server", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["serve", "ask", "metrics"])
+    parser.add_argument("day", nargs="?", help="for ask, e.g. 7")
+    parser.add_argument("part", nargs="?", type=int, choices=(1, 2), help="for ask")
+    parser.add_argument("--input", help="for ask: input file (default: the puzzle input)")
+    parser.add_argument("--socket", default=SOCKET)
+    parser.add_argument("--port", type=int, help="use localhost TCP instead of a Unix socket")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--timeout", type=float, default=TIMEOUT, help="seconds per request")
+    parser.add_argument("--max-pending", type=int, default=MAX_PENDING,
+                        help="requests in flight before the server stops reading")
+    parser.add_argument("--days", nargs="+", default=[],
+                        help="only warm up these days (default: all)")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        try:
+            asyncio.run(serve(args.socket, args.port, workers=args.workers, timeout=args.timeout,
+                              max_pending=args.max_pending,
+                              days=[module_name(day) for day in args.days]))
+        except KeyboardInterrupt:
+            pass
+        return
+
+    if args.command == "metrics":
+        request: Dict[str, Any] = {"op": "metrics"}
+    else:
+        if args.day is None or args.part is None:
+            parser.error("ask needs a day and a part")
+        request = {"id": 1, "day": args.day, "part": args.part}
+        if args.input:
+            with open(args.input) as f:
+                request["input"] = f.read()
+
+    print(json.dumps(ask(request, args.socket, args.port), indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""
+Find out how a solution scales before feeding it something big. It
+times each phase on generated inputs of geometrically increasing size,
+fits both a power law (t = a * n^k) and an exponential (t = a * e^(b n))
+to the timings, and reports whichever fits better, along with how big
+the input can get before the phase takes longer than the budget:
+
+    python -m advent2020.sweep                     # the usual suspects (see SUSPECTS)
+    python -m advent2020.sweep 7 9 --factor 2 --steps 10
+    python -m advent2020.sweep day10.count_paths --budget 0.5
+
+The sizes are in multiples of the real input's size ("scale"), starting
+at --start and multiplying by --factor each step. A day stops growing
+once a phase goes over the budget, or its process goes over --timeout.
+Every timing goes to the CSV (default sweep.csv), the fits to the table.
+
+Timings shorter than MIN_SECONDS are mostly overhead,
+so they're left out of the fits.
+"""
+from __future__ import annotations
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+import argparse
+import csv
+import math
+import multiprocessing
+import time
+
+import numpy as np
+
+from advent2020 import bench, generators
+from advent2020.runner import available_days, load_day, module_name
+
+# the functions we're worried about, and the phase that calls them
+SUSPECTS: Dict[str, Tuple[str, str]] = {
+    "day07.num_bags_inside": ("day07", "part2"),
+    "day09.range_with_sum": ("day09", "part2"),
+    "day10.count_paths": ("day10", "part2"),
+    "day20.assemble_image": ("day20", "part2"),
+}
+
+START = 0.25
+FACTOR = 2.0
+STEPS = 8
+BUDGET = 1.0
+TIMEOUT = 120.0
+MIN_SECONDS = 1e-4
+
+# the exponential has to fit this much better (in squared log error),
+# on at least this many points, before we believe it over the power law
+EXPONENTIAL_MARGIN = 0.5
+EXPONENTIAL_POINTS = 4
+
+CSV_FIELDS = ["day", "phase", "size", "scale", "input_bytes", "status",
+              "runs", "min", "median", "p95"]
+
+
+class Fit(NamedTuple):
+    day: str
+    phase: str
+    model: str        # "power", "exponential", or "-" if there weren't enough points
+    a: float
+    k: float          # the exponent of n, or the rate b of the exponential
+    error: float      # mean squared error of log(t)
+    points: int
+
+    def predict(self, scale: float) -> float:
+        if self.model == "power":
+            return self.a * scale ** self.k
+        return self.a * math.exp(self.k * scale)
+
+    def describe(self) -> str:
+        if self.model == "power":
+            names = {0: "constant", 1: "linear", 2: "quadratic", 3: "cubic"}
+            nearest = round(self.k)
+            if abs(self.k - nearest) < 0.25 and nearest in names:
+                return f"{names[nearest]} (n^{self.k:.2f})"
+            return f"n^{self.k:.2f}"
+        if self.model == "exponential":
+            return f"exponential (x2 every {math.log(2) / self.k:.2g}x)"
+        return "-"
+
+    def scale_at(self, seconds: float) -> Optional[float]:
+        """
+        The (extrapolated) scale where it takes `seconds`,
+        or None if it never gets there
+        """
+        if self.model == "-" or self.k <= 0:
+            return None
+        if self.model == "power":
+            return (seconds / self.a) ** (1 / self.k)
+        return math.log(seconds / self.a) / self.k
+
+
+def fit(day: str, phase: str, scales: Sequence[float], times: Sequence[float]) -> Fit:
+    """
+    Least squares on log(t), against log(n) for the power law
+    and against n for the exponential
+    """
+    points = [(n, t) for n, t in zip(scales, times) if t >= MIN_SECONDS]
+    if len(points) < 3:
+        return Fit(day, phase, "-", 0.0, 0.0, 0.0, len(points))
+
+    n = np.array([p[0] for p in points])
+    log_t = np.log([p[1] for p in points])
+
+    fits = []
+    for model, x in [("power", np.log(n)), ("exponential", n)]:
+        slope, intercept = np.polyfit(x, log_t, 1)
+        error = float(np.mean((slope * x + intercept - log_t) ** 2))
+        fits.append(Fit(day, phase, model, math.exp(intercept), float(slope), error, len(points)))
+
+    power, exponential = fits
+    if len(points) >= EXPONENTIAL_POINTS and exponential.error < power.error * EXPONENTIAL_MARGIN:
+        return exponential
+    return power
+
+
+def time_phases(conn: Any, day: str, size: int, seed: int, repeat: int, budget: float) -> None:
+    """
+    Runs in the child process: the phase timings for one generated input
+    """
+    try:
+        module = load_day(day)
+        raw = generators.generate(day, size, seed).raw
+
+        runs = []
+        started = time.perf_counter()
+        while len(runs) < repeat and (not runs or time.perf_counter() - started < budget):
+            runs.append(bench.run_once(module, raw))
+
+        conn.send(("ok", {
+            "input_bytes": len(raw),
+            "phases": {phase: bench.summarize([run["times"][phase] for run in runs])
+                       for phase in bench.PHASES},
+        }))
+    except Exception as e:
+        conn.send(("error", f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+
+def time_size(day: str, size: int, seed: int, repeat: int, budget: float,
+              timeout: float) -> Dict[str, Any]:
+    parent, child = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=time_phases,
+                                      args=(child, day, size, seed, repeat, budget))
+    process.start()
+    child.close()
+
+    result: Dict[str, Any] = {"status": "timeout"}
+    if parent.poll(timeout):
+        status, payload = parent.recv()
+        result = {"status": status, **payload} if status == "ok" else {"status": status, "error": payload}
+
+    process.terminate()
+    process.join()
+    return result
+
+
+def sweep_day(day: str, phases: Sequence[str], start: float = START, factor: float = FACTOR,
+              steps: int = STEPS, seed: int = 0, repeat: int = 3, budget: float = BUDGET,
+              timeout: float = TIMEOUT) -> Tuple[List[Dict[str, Any]], List[Fit]]:
+    """
+    The CSV rows for every size we timed, and a fit for each phase
+    """
+    base = generators.BASE_SIZES[day.split("_")[0]]
+    rows = []
+    seen = set()
+
+    for step in range(steps):
+        size = max(1, round(base * start * factor ** step))
+        if size in seen:
+            continue
+        seen.add(size)
+
+        result = time_size(day, size, seed, repeat, budget, timeout)
+        for phase in phases:
+            row: Dict[str, Any] = {"day": day, "phase": phase, "size": size,
+                                   "scale": size / base, "status": result["status"]}
+            if result["status"] == "ok":
+                row["input_bytes"] = result["input_bytes"]
+                stats = result["phases"][phase]
+                row.update({key: stats[key] for key in ("runs", "min", "median", "p95")})
+            rows.append(row)
+
+        if result["status"] != "ok":
+            print(f"{day} size {size}: {result['status']} {result.get('error', '')}", flush=True)
+            break
+        print(f"{day} size {size}: " + ", ".join(
+            f"{phase} {result['phases'][phase]['median'] * 1000:.2f}ms" for phase in phases),
+            flush=True)
+        if any(result["phases"][phase]["median"] > budget for phase in phases):
+            break
+
+    fits = []
+    for phase in phases:
+        ok = [row for row in rows if row["phase"] == phase and row["status"] == "ok"]
+        fits.append(fit(day, phase, [row["scale"] for row in ok], [row["median"] for row in ok]))
+    return rows, fits
+
+
+def format_fits(fits: Sequence[Fit], budget: float) -> str:
+    lines = [f"{'day':<9} {'phase':<6} {'points':>6}  {'complexity':<32} "
+             f"{'t(1x) ms':>10} {f'{budget:g}s at':>10}"]
+    for f in fits:
+        if f.model == "-":
+            lines.append(f"{f.day:<9} {f.phase:<6} {f.points:>6}  too fast to fit")
+            continue
+        at = f.scale_at(budget)
+        lines.append(f"{f.day:<9} {f.phase:<6} {f.points:>6}  {f.describe():<32} "
+                     f"{f.predict(1) * 1000:>10.2f} {'never' if at is None else f'{at:.3g}x':>10}")
+    return "\n".join(lines)
+
+
+def resolve(targets: Sequence[str]) -> List[Tuple[str, Sequence[str]]]:
+    """
+    Each target is a day (meaning all its phases)
+    or one of the SUSPECTS (meaning the phase that calls it)
+    """
+    resolved = []
+    for target in targets:
+        if target in SUSPECTS:
+            day, phase = SUSPECTS[target]
+            resolved.append((day, [phase]))
+        else:
+            resolved.append((module_name(target), bench.PHASES))
+    return resolved
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="advent2020-sweep", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("targets", nargs="*",
+                        help="days, or functions from SUSPECTS (default: all the SUSPECTS)")
+    parser.add_argument("--start", type=float, default=START,
+                        help=f"smallest scale (default: {START})")
+    parser.add_argument("--factor", type=float, default=FACTOR,
+                        help=f"how much bigger each step is (default: {FACTOR})")
+    parser.add_argument("--steps", type=int, default=STEPS,
+                        help=f"at most this many sizes (default: {STEPS})")
+    parser.add_argument("--budget", type=float, default=BUDGET,
+                        help=f"seconds a phase may take (default: {BUDGET})")
+    parser.add_argument("--timeout", type=float, default=TIMEOUT,
+                        help=f"seconds allowed for each size (default: {TIMEOUT})")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="sweep.csv")
+    args = parser.parse_args(argv)
+
+    try:
+        targets = resolve(args.targets or list(SUSPECTS))
+    except ValueError as e:
+        parser.error(str(e))
+    for day, _ in targets:
+        if day not in available_days() or generators.generator_for(day) is None:
+            parser.error(f"no generator for {day}")
+
+    rows: List[Dict[str, Any]] = []
+    fits: List[Fit] = []
+    for day, phases in targets:
+        day_rows, day_fits = sweep_day(day, phases, args.start, args.factor, args.steps,
+                                       args.seed, args.repeat, args.budget, args.timeout)
+        rows.extend(day_rows)
+        fits.extend(day_fits)
+
+    with open(args.output, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+    print()
+    print(format_fits(fits, args.budget))
+
+
+if __name__ == "__main__":
+    main()
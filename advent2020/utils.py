@@ -1,2 +1,200 @@
-if __name__ == "__main__":
-    print("utils")    
\ No newline at end of file
+"""
+Helpers shared by the days.
+
+Reading input: `lines` and `records` iterate lazily over either the raw
+text or an open file, so the same code that handles the puzzle input
+can get through a multi-GB file in constant memory, and `mapped_lines`
+does the same through an mmap of the file.
+
+Instrumentation, for finding out where the time goes, e.g.
+
+    advent2020 22 --profile day22
+
+writes the wall time and call counts for each phase (parse, part1, part2)
+and for every function decorated with `@timed` to day22.json,
+and the cProfile stats to day22.prof.
+
+It's switched on by the ADVENT2020_PROFILE environment variable, which
+has to be set before the day modules get imported. When it's not set,
+`timed` hands back the function unchanged and `phase` does nothing,
+so the hooks cost nothing.
+"""
+from __future__ import annotations
+from typing import Any, Callable, ContextManager, Dict, Iterable, Iterator, Optional, TypeVar, Union
+import contextlib
+import cProfile
+import functools
+import inspect
+import io
+import itertools
+import json
+import mmap
+import os
+import time
+
+#
+# reading input
+#
+
+# either the raw text itself, or its lines (e.g. an open file, or mapped_lines)
+Source = Union[str, Iterable[str]]
+
+
+def lines(source: Source) -> Iterator[str]:
+    """
+    The lines one at a time, without their newlines
+    """
+    stream = io.StringIO(source) if isinstance(source, str) else source
+    for line in stream:
+        yield line.rstrip("\r\n")
+
+
+def records(source: Source) -> Iterator[Iterator[str]]:
+    """
+    The groups of lines separated by blank lines, each of which is itself
+    an iterator (so a huge record doesn't have to fit in memory either).
+    As with itertools.groupby, a record has to be used up before
+    moving on to the next one.
+    """
+    for blank, group in itertools.groupby(lines(source), key=lambda line: not line.strip()):
+        if not blank:
+            yield group
+
+
+def mapped_lines(path: str, encoding: str = "utf-8") -> Iterator[str]:
+    """
+    Like `lines`, but reading the file through an mmap,
+    which lets the OS page it in and out as needed
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for line in iter(mapped.readline, b""):
+                yield line.decode(encoding).rstrip("\r\n")
+
+
+#
+# instrumentation
+#
+
+PROFILE_ENV = "ADVENT2020_PROFILE"
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class Stats:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.seconds = 0.0
+        self.depth = 0
+
+    def record(self, seconds: float) -> None:
+        self.calls += 1
+        self.seconds += seconds
+
+
+STATS: Dict[str, Stats] = {}
+
+
+def profiling() -> bool:
+    return bool(os.environ.get(PROFILE_ENV))
+
+
+def enable_profiling() -> None:
+    """
+    Set the environment variable (rather than a global) so that
+    worker processes pick it up too
+    """
+    os.environ[PROFILE_ENV] = "1"
+
+
+def stats_for(name: str) -> Stats:
+    if name not in STATS:
+        STATS[name] = Stats()
+    return STATS[name]
+
+
+def reset_stats() -> None:
+    """
+    Zero the counts, keeping the Stats objects that `timed` has hold of
+    """
+    for stats in STATS.values():
+        stats.calls = 0
+        stats.seconds = 0.0
+
+
+def timed(fn: F) -> F:
+    """
+    Record the wall time and number of calls for this function.
+    For recursive functions only the outermost call gets timed
+    (so nothing is counted twice), and for generators it's
+    the time spent producing values.
+    """
+    if not profiling():
+        return fn
+
+    stats = stats_for(f"{fn.__module__}.{fn.__qualname__}")
+
+    if inspect.isgeneratorfunction(fn):
+        @functools.wraps(fn)
+        def generator_wrapper(*args, **kwargs):
+            stats.calls += 1
+            generator = fn(*args, **kwargs)
+            while True:
+                start = time.perf_counter()
+                try:
+                    value = next(generator)
+                except StopIteration as stop:
+                    return stop.value
+                finally:
+                    stats.seconds += time.perf_counter() - start
+                yield value
+
+        return generator_wrapper  # type: ignore
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        stats.calls += 1
+        if stats.depth:
+            return fn(*args, **kwargs)
+
+        stats.depth += 1
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            stats.seconds += time.perf_counter() - start
+            stats.depth -= 1
+
+    return wrapper  # type: ignore
+
+
+@contextlib.contextmanager
+def _phase(name: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats_for(name).record(time.perf_counter() - start)
+
+
+def phase(name: str) -> ContextManager[None]:
+    """
+    Record the wall time for a block, e.g. `with phase("parse"): ...`
+    """
+    return _phase(name) if profiling() else contextlib.nullcontext()
+
+
+def write_profile(path: str, profiler: Optional[cProfile.Profile] = None) -> None:
+    """
+    Write the recorded stats to path.json and (if given)
+    the cProfile stats to path.prof, for use with pstats or snakeviz
+    """
+    with open(f"{path}.json", "w") as f:
+        json.dump({name: {"calls": stats.calls, "seconds": stats.seconds}
+                   for name, stats in STATS.items()
+                   if stats.calls}, f, indent=2)
+
+    if profiler is not None:
+        profiler.dump_stats(f"{path}.prof")